@@ -0,0 +1,589 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled negamax core for SimpleAI (optional).
+
+Same tree, scores and move order as SimpleAI.search; each node reads the
+python-chess bitboards once into a C struct and does the rest in C:
+legal-move counting (mobility, mate/stalemate), insufficient material,
+material/endgame evaluation, game-over tests, the Polyglot Zobrist key and
+MVV-LVA/killer move ordering. python-chess is still used for push/pop and to
+produce the Move objects searched at inner nodes.
+
+The entry point is `search`, installed as SimpleAI.search, so best_move()
+and the root split drive it through the same iterative deepening as the
+pure-Python build. `evaluate`, `legal_move_count`, `is_game_over` and
+`zobrist_hash` are exported for the cross-check tests.
+
+Build: python scripts/build_engine_ext.py
+"""
+from time import monotonic
+
+import chess
+import chess.polyglot
+
+ctypedef unsigned long long u64
+
+cdef extern from *:
+    int __builtin_popcountll(unsigned long long)
+    int __builtin_ctzll(unsigned long long)
+    int __builtin_clzll(unsigned long long)
+
+# keep in sync with engine.simple_ai
+cdef enum:
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+cdef enum:
+    PAWN = 1
+    KNIGHT = 2
+    BISHOP = 3
+    ROOK = 4
+    QUEEN = 5
+    KING = 6
+
+cdef int PIECE_VAL[7]
+PIECE_VAL[:] = [0, 100, 320, 330, 500, 900, 0]
+cdef int ENDGAME_PIECES = 7
+cdef int PAWN_ADVANCE = 10
+cdef int KING_CENTER = 8
+cdef int MATE = 10_000
+
+cdef double NEG_INF = float("-inf")
+cdef u64 FILE_A = 0x0101010101010101ULL
+cdef u64 FILE_H = FILE_A << 7
+cdef u64 RANK_1 = 0xFFULL
+cdef u64 RANK_8 = RANK_1 << 56
+cdef u64 DARK_SQUARES = 0xAA55AA55AA55AA55ULL
+
+cdef u64 KNIGHT_ATT[64]
+cdef u64 KING_ATT[64]
+cdef u64 PAWN_ATT[2][64]  # [color][square], color 1 = white
+cdef int CENTER_DIST[64]
+cdef u64 RANDOM[781]
+
+cdef inline u64 _bit(int sq):
+    return (<u64>1) << sq
+
+cdef inline int _lsb(u64 b):
+    return __builtin_ctzll(b)
+
+cdef inline int _msb(u64 b):
+    return 63 - __builtin_clzll(b)
+
+cdef inline int _popcount(u64 b):
+    return __builtin_popcountll(b)
+
+def _step_mask(int sq, deltas):
+    att = 0
+    for df, dr in deltas:
+        f, r = sq % 8 + df, sq // 8 + dr
+        if 0 <= f < 8 and 0 <= r < 8:
+            att |= 1 << (r * 8 + f)
+    return att
+
+cdef _build_tables():
+    cdef int sq, i
+    knight = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+    king = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+    for sq in range(64):
+        KNIGHT_ATT[sq] = _step_mask(sq, knight)
+        KING_ATT[sq] = _step_mask(sq, king)
+        PAWN_ATT[1][sq] = _step_mask(sq, ((-1, 1), (1, 1)))
+        PAWN_ATT[0][sq] = _step_mask(sq, ((-1, -1), (1, -1)))
+        CENTER_DIST[sq] = min(chess.square_distance(sq, c) for c in (chess.D4, chess.E4, chess.D5, chess.E5))
+    for i in range(781):
+        RANDOM[i] = chess.polyglot.POLYGLOT_RANDOM_ARRAY[i]
+
+_build_tables()
+
+cdef inline u64 _ray(int sq, int df, int dr, u64 occ):
+    cdef u64 att = 0, b
+    cdef int f = sq % 8 + df, r = sq // 8 + dr
+    while 0 <= f < 8 and 0 <= r < 8:
+        b = _bit(r * 8 + f)
+        att |= b
+        if occ & b:
+            break
+        f += df
+        r += dr
+    return att
+
+cdef inline u64 _diag(int sq, u64 occ):
+    return _ray(sq, 1, 1, occ) | _ray(sq, 1, -1, occ) | _ray(sq, -1, 1, occ) | _ray(sq, -1, -1, occ)
+
+cdef inline u64 _orth(int sq, u64 occ):
+    return _ray(sq, 1, 0, occ) | _ray(sq, -1, 0, occ) | _ray(sq, 0, 1, occ) | _ray(sq, 0, -1, occ)
+
+# ----------------------------
+#  Position snapshot (one read of the board's bitboards per node)
+# ----------------------------
+cdef struct Pos:
+    u64 pawns, knights, bishops, rooks, queens, kings, promoted
+    u64 white, black, occ
+    u64 castling  # clean castling rights, as python-chess would use them
+    int turn      # 1 = white to move
+    int ep        # en passant square, -1 if none
+    int clock     # halfmove clock
+
+cdef inline void _read(object board, Pos* p) except *:
+    co = board.occupied_co
+    p.black = co[0]
+    p.white = co[1]
+    p.pawns = board.pawns
+    p.knights = board.knights
+    p.bishops = board.bishops
+    p.rooks = board.rooks
+    p.queens = board.queens
+    p.kings = board.kings
+    p.promoted = board.promoted
+    p.occ = board.occupied
+    p.turn = 1 if board.turn else 0
+    ep = board.ep_square
+    p.ep = -1 if ep is None else ep
+    p.clock = board.halfmove_clock
+    # clean_castling_rights(): once moves are on the stack the rights are already clean
+    p.castling = board.castling_rights if board._stack else board.clean_castling_rights()
+
+cdef inline u64 _us(Pos* p):
+    return p.white if p.turn else p.black
+
+cdef inline u64 _them(Pos* p):
+    return p.black if p.turn else p.white
+
+cdef inline int _piece_type(Pos* p, int sq):
+    cdef u64 m = _bit(sq)
+    if not p.occ & m:
+        return 0
+    if p.pawns & m: return PAWN
+    if p.knights & m: return KNIGHT
+    if p.bishops & m: return BISHOP
+    if p.rooks & m: return ROOK
+    if p.queens & m: return QUEEN
+    return KING
+
+cdef inline u64 _attackers(Pos* p, int sq, u64 occ, u64 by, int by_white):
+    # pieces in `by` attacking sq with occupancy `occ` (Board.attackers_mask)
+    return by & ((KNIGHT_ATT[sq] & p.knights) | (KING_ATT[sq] & p.kings)
+                 | (PAWN_ATT[0 if by_white else 1][sq] & p.pawns)
+                 | (_diag(sq, occ) & (p.bishops | p.queens))
+                 | (_orth(sq, occ) & (p.rooks | p.queens)))
+
+cdef inline int _king_sq(Pos* p, int white):
+    cdef u64 k = (p.white if white else p.black) & p.kings & ~p.promoted
+    return _msb(k) if k else -1
+
+cdef inline bint _in_check(Pos* p):
+    cdef int k = _king_sq(p, p.turn)
+    return k >= 0 and _attackers(p, k, p.occ, _them(p), not p.turn) != 0
+
+cdef inline bint _is_en_passant(Pos* p, int frm, int to):
+    cdef int d = to - frm
+    return (p.ep == to and (p.pawns & _bit(frm)) != 0 and (d == 7 or d == -7 or d == 9 or d == -9)
+            and not p.occ & _bit(to))
+
+cdef inline bint _is_capture(Pos* p, int frm, int to):
+    return ((_bit(frm) ^ _bit(to)) & _them(p)) != 0 or _is_en_passant(p, frm, to)
+
+cdef bint _has_insufficient(Pos* p, int white):
+    cdef u64 mine = p.white if white else p.black
+    cdef u64 theirs = p.black if white else p.white
+    if mine & (p.pawns | p.rooks | p.queens):
+        return False
+    if mine & p.knights:
+        return _popcount(mine) <= 2 and not (theirs & ~p.kings & ~p.queens)
+    if mine & p.bishops:
+        return ((not p.bishops & DARK_SQUARES) or (not p.bishops & ~DARK_SQUARES)) \
+            and not p.pawns and not p.knights
+    return True
+
+cdef inline bint _insufficient(Pos* p):
+    return _has_insufficient(p, 1) and _has_insufficient(p, 0)
+
+# ----------------------------
+#  Legal move counting (make-and-test on bitboards)
+# ----------------------------
+cdef inline bint _safe(Pos* p, int king, int frm, int to, int captured_sq):
+    # is our king safe after frm->to (capturing on captured_sq, -1 if none)?
+    cdef u64 occ = (p.occ & ~_bit(frm)) | _bit(to)
+    cdef u64 them = _them(p) & ~_bit(to)
+    if captured_sq >= 0:
+        occ &= ~_bit(captured_sq)
+        them &= ~_bit(captured_sq)
+    if frm == king:
+        king = to
+    return _attackers(p, king, occ, them, not p.turn) == 0
+
+cdef inline u64 _between_on_rank(int a, int b):
+    cdef int lo = a if a < b else b
+    cdef int hi = b if a < b else a
+    if hi - lo < 2:
+        return 0
+    return (_bit(hi) - 1) & ~(_bit(lo + 1) - 1)
+
+cdef bint _attacked_for_king(Pos* p, u64 path, u64 occ):
+    cdef u64 them = _them(p)
+    while path:
+        if _attackers(p, _lsb(path), occ, them, not p.turn):
+            return True
+        path &= path - 1
+    return False
+
+cdef int _castling_count(Pos* p):
+    # Board.generate_castling_moves, counted
+    cdef u64 backrank = RANK_1 if p.turn else RANK_8
+    cdef u64 king = _us(p) & p.kings & ~p.promoted & backrank
+    cdef u64 cands, rook, king_to, rook_to, king_path, rook_path
+    cdef int n = 0, k, cand, base
+    king &= (~king + 1)  # lowest
+    if not king:
+        return 0
+    k = _lsb(king)
+    base = 0 if p.turn else 56
+    cands = p.castling & backrank
+    while cands:
+        cand = _lsb(cands)
+        cands &= cands - 1
+        rook = _bit(cand)
+        if rook < king:
+            king_to, rook_to = _bit(base + 2), _bit(base + 3)
+        else:
+            king_to, rook_to = _bit(base + 6), _bit(base + 5)
+        king_path = _between_on_rank(k, _lsb(king_to))
+        rook_path = _between_on_rank(cand, _lsb(rook_to))
+        if not ((p.occ ^ king ^ rook) & (king_path | rook_path | king_to | rook_to)
+                or _attacked_for_king(p, king_path | king, p.occ ^ king)
+                or _attacked_for_king(p, king_to, p.occ ^ king ^ rook ^ rook_to)):
+            n += 1
+    return n
+
+cdef int _legal_count(Pos* p, object board, int limit) except -1:
+    """Number of legal moves (Board.legal_moves.count()); stops early at `limit` (0: no limit)."""
+    cdef u64 us = _us(p), them = _them(p)
+    cdef u64 pieces, targets, single, double, my_kings = us & p.kings
+    cdef int king, frm, to, n = 0, pt, step, ep_victim
+    cdef bint checked = True
+    if my_kings & (my_kings - 1):
+        return board.legal_moves.count()  # several kings: leave it to python-chess
+    king = _msb(my_kings) if my_kings else -1
+    if king < 0:
+        checked = False  # no king: every pseudo-legal move is legal
+
+    pieces = us & ~p.pawns
+    while pieces:
+        frm = _lsb(pieces)
+        pieces &= pieces - 1
+        pt = _piece_type(p, frm)
+        if pt == KNIGHT:
+            targets = KNIGHT_ATT[frm]
+        elif pt == KING:
+            targets = KING_ATT[frm]
+        elif pt == BISHOP:
+            targets = _diag(frm, p.occ)
+        elif pt == ROOK:
+            targets = _orth(frm, p.occ)
+        else:
+            targets = _diag(frm, p.occ) | _orth(frm, p.occ)
+        targets &= ~us
+        while targets:
+            to = _lsb(targets)
+            targets &= targets - 1
+            if not checked or _safe(p, king, frm, to, -1):
+                n += 1
+                if limit and n >= limit:
+                    return n
+    if king >= 0 and not _in_check(p):
+        n += _castling_count(p)
+    if limit and n >= limit:
+        return n
+
+    pieces = us & p.pawns
+    step = 8 if p.turn else -8
+    while pieces:
+        frm = _lsb(pieces)
+        pieces &= pieces - 1
+        targets = PAWN_ATT[p.turn][frm] & them
+        while targets:
+            to = _lsb(targets)
+            targets &= targets - 1
+            if not checked or _safe(p, king, frm, to, -1):
+                n += 4 if (to < 8 or to >= 56) else 1
+    pieces = us & p.pawns
+    if p.turn:
+        single = (pieces << 8) & ~p.occ
+        double = (single << 8) & ~p.occ & (0xFFFF0000ULL)  # ranks 3|4
+    else:
+        single = (pieces >> 8) & ~p.occ
+        double = (single >> 8) & ~p.occ & (0xFFFF0000ULL << 16)  # ranks 6|5
+    while single:
+        to = _lsb(single)
+        single &= single - 1
+        if not checked or _safe(p, king, to - step, to, -1):
+            n += 4 if (to < 8 or to >= 56) else 1
+    while double:
+        to = _lsb(double)
+        double &= double - 1
+        if not checked or _safe(p, king, to - 2 * step, to, -1):
+            n += 1
+    if p.ep > 0 and not p.occ & _bit(p.ep):
+        targets = pieces & PAWN_ATT[0 if p.turn else 1][p.ep] & (0xFFULL << (32 if p.turn else 24))
+        ep_victim = p.ep - step
+        while targets:
+            frm = _lsb(targets)
+            targets &= targets - 1
+            if not checked or _safe(p, king, frm, p.ep, ep_victim):
+                n += 1
+    return n
+
+# ----------------------------
+#  Evaluation / terminal tests (SimpleAI.evaluate, Board.is_game_over)
+# ----------------------------
+cdef inline int _material(Pos* p):
+    cdef int score = 0
+    score += PIECE_VAL[PAWN] * (_popcount(p.pawns & p.white) - _popcount(p.pawns & p.black))
+    score += PIECE_VAL[KNIGHT] * (_popcount(p.knights & p.white) - _popcount(p.knights & p.black))
+    score += PIECE_VAL[BISHOP] * (_popcount(p.bishops & p.white) - _popcount(p.bishops & p.black))
+    score += PIECE_VAL[ROOK] * (_popcount(p.rooks & p.white) - _popcount(p.rooks & p.black))
+    score += PIECE_VAL[QUEEN] * (_popcount(p.queens & p.white) - _popcount(p.queens & p.black))
+    return score
+
+cdef int _evaluate(Pos* p, object board) except? -99999:
+    cdef int score, mob, wk, bk
+    cdef bint in_check
+    cdef u64 b
+    if _popcount(p.occ) <= ENDGAME_PIECES:
+        if _legal_count(p, board, 1) == 0:
+            if _in_check(p):
+                return -MATE if p.turn else MATE
+            return 0
+        if _insufficient(p):
+            return 0
+        score = _material(p)
+        b = p.pawns & p.white
+        while b:
+            score += PAWN_ADVANCE * (_lsb(b) // 8 - 1)
+            b &= b - 1
+        b = p.pawns & p.black
+        while b:
+            score -= PAWN_ADVANCE * (6 - _lsb(b) // 8)
+            b &= b - 1
+        wk, bk = _king_sq(p, 1), _king_sq(p, 0)
+        if wk >= 0 and bk >= 0:
+            score += KING_CENTER * (CENTER_DIST[bk] - CENTER_DIST[wk])
+        return score
+    mob = _legal_count(p, board, 0)
+    in_check = _in_check(p)
+    if mob == 0:
+        if in_check:
+            return -MATE if p.turn else MATE
+        return 0
+    if _insufficient(p):
+        return 0
+    score = _material(p)
+    score += mob * 2 if p.turn else -mob * 2
+    if in_check:
+        score += 15 if p.turn else -15
+    return score
+
+cdef bint _game_over(Pos* p, object board) except -1:
+    if _legal_count(p, board, 1) == 0 or _insufficient(p) or p.clock >= 150:
+        return True
+    # fivefold needs 4 earlier occurrences >= 4 plies apart, all reversible
+    return p.clock >= 16 and board.is_fivefold_repetition()
+
+cdef u64 _zobrist(Pos* p):
+    # chess.polyglot.zobrist_hash
+    cdef u64 h = 0, b, king, rights, ep_mask, backrank
+    cdef int pivot, sq, color
+    for pivot in range(2):
+        b = p.white if pivot else p.black
+        while b:
+            sq = _lsb(b)
+            b &= b - 1
+            h ^= RANDOM[64 * ((_piece_type(p, sq) - 1) * 2 + pivot) + sq]
+    for color in range(2):  # white kingside, white queenside, black kingside, black queenside
+        backrank = RANK_1 if color == 0 else RANK_8
+        king = (p.white if color == 0 else p.black) & p.kings & backrank & ~p.promoted
+        if not king:
+            continue
+        rights = p.castling & backrank
+        b = rights
+        while b:
+            if (b & (~b + 1)) > king:
+                h ^= RANDOM[768 + 2 * color]
+                break
+            b &= b - 1
+        b = rights
+        while b:
+            if (b & (~b + 1)) < king:
+                h ^= RANDOM[768 + 2 * color + 1]
+                break
+            b &= b - 1
+    if p.ep > 0:
+        ep_mask = _bit(p.ep) >> 8 if p.turn else _bit(p.ep) << 8
+        ep_mask = ((ep_mask >> 1) & ~FILE_H) | ((ep_mask << 1) & ~FILE_A)
+        if ep_mask & p.pawns & _us(p):
+            h ^= RANDOM[772 + p.ep % 8]
+    if p.turn:
+        h ^= RANDOM[780]
+    return h
+
+# ----------------------------
+#  Search (SimpleAI.search + order_moves + _store_killer + _tt_store)
+# ----------------------------
+cdef class _Ctx:
+    cdef object ai, tt, killers, timeout
+    cdef long long nodes, check_every, tt_max
+    cdef int max_ply
+    cdef bint has_deadline
+    cdef double deadline
+
+cdef inline bint _killer_ok(Pos* p, object board, object k, object tt_move):
+    return (k is not None and k != tt_move and not _is_capture(p, k.from_square, k.to_square)
+            and board.is_legal(k))
+
+cdef double _search(_Ctx c, object board, int depth, double alpha, double beta, int ply) except? -1e300:
+    cdef Pos p
+    cdef double alpha_orig, best, score, value
+    cdef int flag, n, i, j, stage, key
+    cdef int keys[256]
+    cdef int order[256]
+    cdef object tt = c.tt
+    cdef object entry, tt_move = None, best_mv = None, mv, h, killers, slot, moves
+    cdef object k0 = None, k1 = None
+    cdef list captures
+    cdef bint cut = False
+
+    c.nodes += 1
+    if c.has_deadline and c.nodes % c.check_every == 0 and monotonic() >= c.deadline:
+        raise c.timeout
+    _read(board, &p)
+    if depth == 0 or _game_over(&p, board):
+        return _evaluate(&p, board)
+
+    h = _zobrist(&p)
+    entry = tt.get(h)
+    if entry is not None:
+        tt_move = entry[3]
+        if entry[0] >= depth:
+            value = entry[1]
+            flag = entry[2]
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            elif flag == UPPER:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+    alpha_orig = alpha
+    best = NEG_INF
+    push, pop = board.push, board.pop
+    # stages: TT move → captures (MVV-LVA) → killers → quiets, as in SimpleAI.order_moves
+    if tt_move is not None and not board.is_legal(tt_move):
+        tt_move = None
+    for stage in range(4):
+        if stage == 0:
+            if tt_move is None:
+                continue
+            moves = (tt_move,)
+        elif stage == 1:
+            captures = [m for m in board.generate_legal_captures() if m != tt_move]
+            n = len(captures)
+            if n > 256:
+                n = 256  # can't happen in chess; keeps the arrays in bounds
+            for i in range(n):
+                mv = captures[i]
+                key = _piece_type(&p, mv.to_square)
+                keys[i] = PIECE_VAL[key if key else PAWN] * 10 - PIECE_VAL[_piece_type(&p, mv.from_square)]
+                # stable insertion, highest key first (list.sort(reverse=True) keeps ties in order)
+                j = i
+                while j > 0 and keys[order[j - 1]] < keys[i]:
+                    order[j] = order[j - 1]
+                    j -= 1
+                order[j] = i
+            moves = [captures[order[i]] for i in range(n)]
+        elif stage == 2:
+            if ply < c.max_ply:
+                killers = c.killers[ply]
+                k0, k1 = killers[0], killers[1]
+            moves = [k for k in (k0, k1) if _killer_ok(&p, board, k, tt_move)]
+        else:
+            moves = board.generate_legal_moves(to_mask=~_them(&p) & 0xFFFFFFFFFFFFFFFFULL)
+        for mv in moves:
+            if stage == 3:
+                if mv.to_square == p.ep and _is_en_passant(&p, mv.from_square, mv.to_square):
+                    continue  # already searched as a capture
+                if mv == tt_move or mv == k0 or mv == k1:
+                    continue
+            push(mv)
+            score = -_search(c, board, depth - 1, -beta, -alpha, ply + 1)
+            pop()
+            if score > best:
+                best = score
+                best_mv = mv
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                if ply < c.max_ply and not _is_capture(&p, mv.from_square, mv.to_square):
+                    slot = c.killers[ply]
+                    if slot[0] != mv:
+                        slot[1] = slot[0]
+                        slot[0] = mv
+                cut = True
+                break
+        if cut:
+            break
+
+    if best <= alpha_orig:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    if len(tt) >= c.tt_max and h not in tt:
+        tt.clear()
+    tt[h] = (depth, best, flag, best_mv)
+    return best
+
+
+def search(ai, board, int depth, double alpha, double beta, int ply=0):
+    cdef _Ctx c = _Ctx()
+    c.ai = ai
+    c.tt = ai.tt
+    c.killers = ai.killers
+    c.timeout = ai._Timeout
+    c.nodes = ai.nodes
+    c.check_every = ai.CHECK_EVERY
+    c.tt_max = ai.TT_MAX
+    c.max_ply = ai.MAX_PLY
+    c.has_deadline = ai._deadline is not None
+    c.deadline = ai._deadline if c.has_deadline else 0.0
+    try:
+        return _search(c, board, depth, alpha, beta, ply)
+    finally:
+        ai.nodes = c.nodes
+
+# ----------------------------
+#  Exported for the cross-check tests
+# ----------------------------
+def evaluate(board):
+    cdef Pos p
+    _read(board, &p)
+    return _evaluate(&p, board)
+
+def legal_move_count(board):
+    cdef Pos p
+    _read(board, &p)
+    return _legal_count(&p, board, 0)
+
+def is_game_over(board):
+    cdef Pos p
+    _read(board, &p)
+    return _game_over(&p, board)
+
+def zobrist_hash(board):
+    cdef Pos p
+    _read(board, &p)
+    return _zobrist(&p)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 import chess
 import chess.pgn
+import chess.polyglot
 from io import StringIO
 
 @dataclass
@@ -15,6 +16,11 @@ class GameState:
     def __init__(self, fen: Optional[str] = None):
         self.board = chess.Board(fen) if fen else chess.Board()
         self._last_move = None
+        self._legal_key = None
+        self._legal: frozenset = frozenset()
+        self._targets_key = None
+        self._targets: Dict[int, frozenset] = {}
+        self._reset_pgn()
 
     # ----- Queries -----
     @property
@@ -32,8 +38,32 @@ class GameState:
     def piece_map(self):
         return self.board.piece_map()
 
+    def position_key(self):
+        """Identity of the current position, for caches of derived data.
+
+        Keyed on the position itself (not on our own mutators or the Board
+        object) because the replay panel restores positions on the board
+        directly. Zobrist hash: pieces, side to move, castling, en passant.
+        """
+        return chess.polyglot.zobrist_hash(self.board)
+
+    def legal_move_set(self) -> frozenset:
+        """Legal moves of the current position, generated once per position."""
+        key = self.position_key()
+        if key != self._legal_key:
+            self._legal = frozenset(self.board.legal_moves)
+            self._legal_key = key
+        return self._legal
+
     def legal_moves_from(self, sq: int) -> Set[int]:
-        return {m.to_square for m in self.board.legal_moves if m.from_square == sq}
+        key = self.position_key()
+        if key != self._targets_key:
+            self._targets_key, self._targets = key, {}
+        targets = self._targets.get(sq)
+        if targets is None:
+            targets = self._targets[sq] = frozenset(
+                m.to_square for m in self.board.generate_legal_moves(from_mask=chess.BB_SQUARES[sq]))
+        return set(targets)  # callers mutate their copy (BoardView clears it)
 
     def is_game_over(self) -> bool:
         return self.board.is_game_over()
@@ -58,44 +88,77 @@ class GameState:
             mv = chess.Move.from_uci(uci)
         except Exception:
             return False
-        if mv not in self.board.legal_moves:
+        legal = self.legal_move_set()
+        if mv not in legal:
             # auto-queen promotion attempt
             try:
                 if mv.promotion is None:
                     promo = chess.Move(mv.from_square, mv.to_square, chess.QUEEN)
-                    if promo in self.board.legal_moves:
+                    if promo in legal:
                         mv = promo
             except Exception:
                 pass
-        if mv in self.board.legal_moves:
+        if mv in legal:
             self.board.push(mv)
             self._last_move = mv
+            self._pgn_push(mv)
             return True
         return False
 
     def apply_move(self, move: chess.Move) -> bool:
-        if move in self.board.legal_moves:
+        if move in self.legal_move_set():
             self.board.push(move)
             self._last_move = move
+            self._pgn_push(move)
             return True
         return False
 
     def undo(self, steps: int = 1) -> None:
         for _ in range(min(steps, len(self.board.move_stack))):
             self.board.pop()
+            self._pgn_pop()
         self._last_move = self.board.peek() if self.board.move_stack else None
 
     # ----- PGN -----
+    # The PGN tree is extended alongside our own mutators; export_pgn only
+    # rebuilds it when the board was changed behind our back (e.g. replay).
+    def _reset_pgn(self) -> None:
+        # the game starts at the board's root (a loaded FEN), not the class's standard start
+        root = self.board.root()
+        self._pgn_game = chess.pgn.Game()
+        self._pgn_game.setup(root)
+        self._pgn_fen = root.fen()
+        self._pgn_node = self._pgn_game
+        self._pgn_ply = 0
+
+    def _pgn_push(self, mv: chess.Move) -> None:
+        self._pgn_node = self._pgn_node.add_variation(mv)
+        self._pgn_ply += 1
+
+    def _pgn_pop(self) -> None:
+        node = self._pgn_node
+        if node.parent is None:
+            return
+        node.parent.remove_variation(node)
+        self._pgn_node = node.parent
+        self._pgn_ply -= 1
+
+    def _pgn_in_sync(self) -> bool:
+        stack = self.board.move_stack
+        if self._pgn_ply != len(stack) or self._pgn_fen != self.board.root().fen():
+            return False
+        return not stack or self._pgn_node.move == stack[-1]
+
     def export_pgn(self) -> str:
-        game = chess.pgn.Game()
-        game.setup(self.board.starting_fen)
-        node = game
-        for mv in self.board.move_stack:
-            node = node.add_variation(mv)
+        if not self._pgn_in_sync():
+            self._reset_pgn()
+            for mv in self.board.move_stack:
+                self._pgn_push(mv)
         sio = StringIO()
-        print(game, file=sio, end="")
+        print(self._pgn_game, file=sio, end="")
         return sio.getvalue()
 
     def load_fen(self, fen: str) -> None:
         self.board = chess.Board(fen)
         self._last_move = None
+        self._reset_pgn()
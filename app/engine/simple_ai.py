@@ -1,6 +1,73 @@
 from __future__ import annotations
 import math
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
 import chess
+import chess.polyglot
+
+try:  # optional compiled search core (scripts/build_engine_ext.py)
+    from . import _simple_ai as _ext
+except ImportError:
+    _ext = None
+
+# Transposition-table bound flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class _SearchTimeout(Exception):
+    pass
+
+_CENTER_DIST = [min(chess.square_distance(sq, c) for c in (chess.D4, chess.E4, chess.D5, chess.E5))
+                for sq in chess.SQUARES]
+
+# Shared across SimpleAI instances: the GUI builds a fresh SimpleAI per move
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        # spawn, not fork: the GUI calls in from its AI thread while Tk runs
+        _executor = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+_worker_ai: SimpleAI | None = None
+_worker_root: int | None = None
+
+def _search_root_child(root_fen: str, stack: list[str], uci: str, depth: int,
+                       alpha: float, beta: float, deadline: float | None):
+    """Process-pool task: search one root move in the parent's (alpha, beta) window.
+
+    The game is rebuilt from its root and move list so repetition rules match
+    the parent. Returns (score, nodes), the score from the parent's point of
+    view, or (None, nodes) on timeout. `deadline` is wall-clock (time.time())
+    so all workers share it.
+    """
+    global _worker_ai, _worker_root
+    board = chess.Board(root_fen)
+    for m in stack:
+        board.push_uci(m)
+    root = chess.polyglot.zobrist_hash(board)
+    if _worker_ai is None or root != _worker_root:
+        _worker_ai = SimpleAI()  # TT/killers are kept only between siblings of one root
+        _worker_root = root
+    ai = _worker_ai
+    board.push_uci(uci)
+    ai.nodes = 0
+    ai._deadline = time.monotonic() + (deadline - time.time()) if deadline else None
+    try:
+        score = -ai.search(board, depth, -beta, -alpha, 1)
+    except _SearchTimeout:
+        score = None
+    finally:
+        ai._deadline = None
+    return score, ai.nodes
 
 class SimpleAI:
     """Tiny negamax + alpha-beta with a basic evaluation. For offline fallback only."""
@@ -8,51 +75,261 @@ class SimpleAI:
         chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
         chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0
     }
+    _MATERIAL = tuple((pt, v) for pt, v in PIECE_VAL.items() if v)
+    TT_MAX = 200_000
+    MAX_PLY = 64
+    ASPIRATION = 50
+    ENDGAME_PIECES = 7  # kings included
+    PAWN_ADVANCE = 10
+    KING_CENTER = 8
+    CHECK_EVERY = 256  # nodes between deadline checks
+    _Timeout = _SearchTimeout
+
+    def __init__(self, workers: int = 1):
+        # >1 splits root moves over a process pool (see _best_move_parallel)
+        self.workers = max(1, workers)
+        # zobrist key -> (depth, value, flag, best_move)
+        self.tt: dict[int, tuple] = {}
+        self._root_key: int | None = None
+        # two quiet moves per ply that recently caused a beta cutoff
+        self.killers: list[list[chess.Move | None]] = [[None, None] for _ in range(self.MAX_PLY)]
+        self.nodes = 0
+        self._deadline: float | None = None
+        if _ext is not None:
+            self.search = partial(_ext.search, self)
+
+    def _material(self, board: chess.Board) -> int:
+        popcount, mask = chess.popcount, board.pieces_mask
+        score = 0
+        for pt, val in self._MATERIAL:
+            score += val * (popcount(mask(pt, chess.WHITE)) - popcount(mask(pt, chess.BLACK)))
+        return score
 
     def evaluate(self, board: chess.Board) -> int:
-        if board.is_checkmate():
-            return -10_000 if board.turn else 10_000
-        if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
+        if chess.popcount(board.occupied) <= self.ENDGAME_PIECES:
+            return self._eval_endgame(board)
+        # one legal-move count serves mate/stalemate detection and mobility
+        # (claimable draws are left to the GUI; can_claim_draw() is too costly per leaf)
+        mob = board.legal_moves.count()
+        in_check = board.is_check()
+        if mob == 0:
+            if in_check:
+                return -10_000 if board.turn else 10_000
             return 0
-        score = 0
-        for _, piece in board.piece_map().items():
-            val = self.PIECE_VAL[piece.piece_type]
-            score += val if piece.color == chess.WHITE else -val
+        if board.is_insufficient_material():
+            return 0
+        score = self._material(board)
         # small mobility term
-        mob = len(list(board.legal_moves))
         score += (mob * 2 if board.turn else -mob * 2)
-        if board.is_check():
+        if in_check:
             score += 15 if board.turn else -15
         return score
 
-    def order_moves(self, board, moves):
-        return sorted(moves, key=lambda m: 1 if board.is_capture(m) else 0, reverse=True)
+    def _eval_endgame(self, board: chess.Board) -> int:
+        # Few pieces left: mobility misleads (K+P endings), so only ask whether
+        # any move exists and score pawn advancement + king centralisation.
+        if not any(board.generate_legal_moves()):
+            if board.is_check():
+                return -10_000 if board.turn else 10_000
+            return 0
+        if board.is_insufficient_material():
+            return 0
+        score = self._material(board)
+        white, pawns = board.occupied_co[chess.WHITE], board.pawns
+        for sq in chess.scan_forward(pawns & white):
+            score += self.PAWN_ADVANCE * (chess.square_rank(sq) - 1)
+        for sq in chess.scan_forward(pawns & ~white):
+            score -= self.PAWN_ADVANCE * (6 - chess.square_rank(sq))
+        wk, bk = board.king(chess.WHITE), board.king(chess.BLACK)
+        if wk is not None and bk is not None:
+            score += self.KING_CENTER * (_CENTER_DIST[bk] - _CENTER_DIST[wk])
+        return score
+
+    def order_moves(self, board, ply: int = 0, tt_move: chess.Move | None = None):
+        """Yield TT move → captures (MVV-LVA) → killers → remaining quiets.
+
+        Lazy on purpose: a cutoff on an early move skips generating the quiets.
+        """
+        if tt_move is not None and board.is_legal(tt_move):
+            yield tt_move
+        else:
+            tt_move = None
+        val = self.PIECE_VAL
+        # captures come straight from the bitboard generator; no per-move is_capture()
+        captures = []
+        for m in board.generate_legal_captures():
+            if m != tt_move:
+                victim = board.piece_type_at(m.to_square) or chess.PAWN  # None → en passant
+                captures.append((val[victim] * 10 - val[board.piece_type_at(m.from_square)], m))
+        if len(captures) > 1:
+            captures.sort(key=lambda c: c[0], reverse=True)
+        for _, m in captures:
+            yield m
+        killers = self.killers[ply] if ply < self.MAX_PLY else (None, None)
+        for k in killers:
+            if k is not None and k != tt_move and not board.is_capture(k) and board.is_legal(k):
+                yield k
+        # quiets are not sorted at all
+        ep = board.ep_square
+        for m in board.generate_legal_moves(to_mask=~board.occupied_co[not board.turn] & chess.BB_ALL):
+            if m.to_square == ep and board.is_en_passant(m):
+                continue  # already yielded as a capture
+            if m != tt_move and m not in killers:
+                yield m
 
-    def search(self, board, depth, alpha, beta):
+    def _store_killer(self, board, mv: chess.Move, ply: int) -> None:
+        if ply >= self.MAX_PLY or board.is_capture(mv):
+            return
+        slot = self.killers[ply]
+        if slot[0] != mv:
+            slot[1] = slot[0]
+            slot[0] = mv
+
+    def search(self, board, depth, alpha, beta, ply: int = 0):
+        self.nodes += 1
+        if self._deadline is not None and self.nodes % self.CHECK_EVERY == 0 \
+           and time.monotonic() >= self._deadline:
+            raise _SearchTimeout
         if depth == 0 or board.is_game_over():
             return self.evaluate(board)
-        best = -math.inf
-        for mv in self.order_moves(board, board.legal_moves):
+
+        h = chess.polyglot.zobrist_hash(board)
+        entry = self.tt.get(h)
+        tt_move = entry[3] if entry is not None else None
+        if entry is not None and entry[0] >= depth:
+            _, value, flag, _ = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            elif flag == UPPER:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        best, best_mv = -math.inf, None
+        for mv in self.order_moves(board, ply, tt_move):
             board.push(mv)
-            score = -self.search(board, depth-1, -beta, -alpha)
+            score = -self.search(board, depth-1, -beta, -alpha, ply+1)
             board.pop()
             if score > best:
-                best = score
+                best, best_mv = score, mv
             if best > alpha:
                 alpha = best
             if alpha >= beta:
+                self._store_killer(board, mv, ply)
                 break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._tt_store(h, (depth, best, flag, best_mv))
         return best
 
-    def best_move(self, board: chess.Board, depth: int = 3):
-        best_mv, best_score = None, -math.inf
-        alpha, beta = -math.inf, math.inf
-        for mv in self.order_moves(board, board.legal_moves):
-            board.push(mv)
-            score = -self.search(board, depth-1, -beta, -alpha)
+    def _tt_store(self, key: int, entry: tuple) -> None:
+        # crude bound: drop everything once full (positions rarely repeat across turns anyway)
+        if len(self.tt) >= self.TT_MAX and key not in self.tt:
+            self.tt.clear()
+        self.tt[key] = entry
+
+    def best_move(self, board: chess.Board, depth: int = 3, time_limit_ms: int | None = None):
+        """Iterative deepening up to `depth`; returns the best move of the last finished iteration."""
+        if not any(board.legal_moves):
+            return None
+        root = chess.polyglot.zobrist_hash(board)
+        if root != self._root_key:
+            self.tt.clear()
+            self._root_key = root
+        self.nodes = 0
+        self._deadline = time.monotonic() + time_limit_ms / 1000 if time_limit_ms else None
+        try:
+            if self.workers > 1 and depth >= 2:
+                best_mv = self._best_move_parallel(board, depth, time_limit_ms)
+            else:
+                _, best_mv = self._deepen(board, depth)
+        finally:
+            self._deadline = None
+        if best_mv is None:
+            best_mv = next(iter(board.legal_moves))
+        return best_mv
+
+    def _deepen(self, board: chess.Board, depth: int):
+        """Iterative deepening loop; returns (score, move) of the last completed depth."""
+        root = chess.polyglot.zobrist_hash(board)
+        root_len = len(board.move_stack)
+        best_mv, best_score, score = None, None, 0
+        try:
+            for d in range(1, depth + 1):
+                if d == 1 or math.isinf(score):
+                    alpha, beta = -math.inf, math.inf
+                else:
+                    alpha, beta = score - self.ASPIRATION, score + self.ASPIRATION
+                score = self.search(board, d, alpha, beta)
+                if score <= alpha or score >= beta:
+                    score = self.search(board, d, -math.inf, math.inf)
+                best_score = score
+                entry = self.tt.get(root)
+                if entry is not None and entry[3] is not None:
+                    best_mv = entry[3]
+        except _SearchTimeout:
+            while len(board.move_stack) > root_len:
+                board.pop()
+        return best_score, best_mv
+
+    def _best_move_parallel(self, board: chess.Board, depth: int, time_limit_ms: int | None):
+        # PV split at the last iteration: depths < `depth` and the first
+        # ordered root move are searched here, which fixes alpha. The other
+        # root moves go to the workers as null-window tests against the best
+        # score so far, at most one per worker so later tests see a raised
+        # alpha; a move that fails high is re-searched with an open window.
+        # A move that times out falls back to the serial depth-1 move.
+        _, fallback = self._deepen(board, depth - 1)
+        if fallback is None or self._deadline is not None and time.monotonic() >= self._deadline:
+            return fallback
+        first, *rest = self.order_moves(board, 0, fallback)
+        root_len = len(board.move_stack)
+        try:
+            board.push(first)
+            best = -self.search(board, depth - 1, -math.inf, math.inf, 1)
             board.pop()
-            if score > best_score:
-                best_score, best_mv = score, mv
-            if best_score > alpha:
-                alpha = best_score
+        except _SearchTimeout:
+            while len(board.move_stack) > root_len:
+                board.pop()
+            return fallback
+        best_mv = first
+        deadline = time.time() + (self._deadline - time.monotonic()) if self._deadline else None
+        root_fen = board.root().fen()
+        stack = [m.uci() for m in board.move_stack]
+        pool = _get_executor(self.workers)
+        pending = deque(rest)
+        running: dict = {}  # future -> (move, alpha, beta)
+
+        def submit(mv, alpha, beta):
+            fut = pool.submit(_search_root_child, root_fen, stack, mv.uci(), depth - 1, alpha, beta, deadline)
+            running[fut] = (mv, alpha, beta)
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    submit(pending.popleft(), best, best + 1)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    mv, alpha, beta = running.pop(fut)
+                    score, nodes = fut.result()
+                    self.nodes += nodes
+                    if score is None:
+                        return fallback  # this move never finished the depth
+                    if score <= alpha:
+                        continue  # fails low: no better than the best at submit time
+                    if beta == alpha + 1:
+                        submit(mv, best, math.inf)  # only a lower bound; get the real score
+                    elif score > best:
+                        best, best_mv = score, mv
+        finally:
+            for fut in running:
+                fut.cancel()
         return best_mv
@@ -14,6 +14,9 @@ from services.telemetry import setup_logging
 from replay_bootstrap import attach_replay
 
 DEFAULT_SQ = 72
+AI_DEPTH = 3
+AI_TIME_LIMIT_MS = 2000
+AI_WORKERS = 1  # SimpleAI(workers=N) pays off from depth 4; at AI_DEPTH 3 the process hand-off costs more
 
 class ChessApp(tk.Tk):
     def __init__(self):
@@ -25,13 +28,14 @@ class ChessApp(tk.Tk):
         self.logger = setup_logging(self.project_root)
 
         self.sq_size = DEFAULT_SQ
-        self.assets = load_piece_images(self.project_root, self.sq_size)
+        self.assets = load_piece_images(self.project_root, self.sq_size, self)
 
         self.game = GameState()
         self.ai_color: str | None = None
         self.ai_worker: threading.Thread | None = None
         self.ai_queue: queue.Queue = queue.Queue()
         self.player_bottom: str = "white"
+        self.on_board_replaced = None  # set by attach_replay(); called after self.game/board change
 
         self._build_menu()
         self.status_var = tk.StringVar(value=self.game.status_text())
@@ -42,7 +46,8 @@ class ChessApp(tk.Tk):
         self.status_bar = tk.Label(self, textvariable=self.status_var, anchor="w", padx=8)
         self.status_bar.pack(fill="x")
 
-        self.after(80, self._poll_ai)
+        # AI worker → UI thread hand-off (the worker only posts this virtual event)
+        self.bind("<<EngineMoveReady>>", lambda _e: self._drain_ai_queue())
 
         try:
             attach_replay(self)
@@ -74,6 +79,10 @@ class ChessApp(tk.Tk):
         menubar.add_cascade(label="Mode", menu=mode)
         self.config(menu=menubar)
 
+    def _board_replaced(self):
+        if self.on_board_replaced is not None:
+            self.on_board_replaced()
+
     # ---- Actions ----
     def _on_user_move(self, uci: str):
         # 같은 칸(e7e7) 입력 사전 차단
@@ -89,25 +98,28 @@ class ChessApp(tk.Tk):
             ok = self.game.apply_uci(uci)
             if ok:
                 self.status_var.set(self.game.status_text())
-                self.board_view.redraw()
+                self.board_view.schedule_redraw()
                 self._maybe_start_ai()
             else:
                 messagebox.showwarning("Illegal", f"Illegal move: {uci}")
-                self.board_view.redraw()
+                self.board_view.schedule_redraw()
 
         self.board_view.animate_move(code, mv.from_square, mv.to_square, duration_ms=180, done=commit)
 
     def _new_game(self):
         self._cancel_ai()
+        self.board_view.cancel_animation()
         self.game = GameState()
         self.board_view.game = self.game
+        self._board_replaced()
         self.board_view.set_bottom(self.player_bottom)
         self.status_var.set(self.game.status_text())
-        self.board_view.redraw()
+        self.board_view.schedule_redraw()
         self._maybe_start_ai()
 
     def _undo_move(self):
         self._cancel_ai()
+        self.board_view.cancel_animation()
         if not self.game.board.move_stack:
             return
         self.game.undo(1)
@@ -115,7 +127,7 @@ class ChessApp(tk.Tk):
            (("white" if self.game.board.turn == chess.WHITE else "black") == self.ai_color):
             self.game.undo(1)
         self.status_var.set(self.game.status_text())
-        self.board_view.redraw()
+        self.board_view.schedule_redraw()
         self._maybe_start_ai()
 
     def _load_fen(self):
@@ -124,9 +136,11 @@ class ChessApp(tk.Tk):
             return
         try:
             self._cancel_ai()
+            self.board_view.cancel_animation()
             self.game.load_fen(fen)
+            self._board_replaced()
             self.status_var.set(self.game.status_text())
-            self.board_view.redraw()
+            self.board_view.schedule_redraw()
             self._maybe_start_ai()
         except Exception as e:
             messagebox.showerror("FEN Error", str(e))
@@ -156,6 +170,7 @@ class ChessApp(tk.Tk):
     # ---- AI control (local simple_ai) ----
     def _cancel_ai(self):
         self.ai_worker = None  # simple thread, no cancel hook
+        self.board_view.busy = False
 
     def _maybe_start_ai(self):
         if self.game.is_game_over() or self.ai_color is None:
@@ -166,38 +181,48 @@ class ChessApp(tk.Tk):
         if side != self.ai_color:
             return
 
+        # search a private copy: the UI thread keeps reading self.game.board meanwhile
+        board = self.game.board.copy()
+
         def run_ai():
             try:
-                mv = SimpleAI().best_move(self.game.board, depth=3)
+                mv = SimpleAI(workers=AI_WORKERS).best_move(board, depth=AI_DEPTH, time_limit_ms=AI_TIME_LIMIT_MS)
                 if mv:
                     self.ai_queue.put(("move", {"move": mv.uci()}))
                 else:
                     self.ai_queue.put(("error", {"error": "no_move"}))
             except Exception as e:
                 self.ai_queue.put(("error", {"error": "exception", "detail": str(e)}))
+            # wake the Tk loop only when there is something to drain
+            try:
+                self.event_generate("<<EngineMoveReady>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                pass  # window closed while thinking
 
+        self.board_view.busy = True  # reject board input until the reply arrives
         t = threading.Thread(target=run_ai, daemon=True)
         self.ai_worker = t
         t.start()
 
-    def _poll_ai(self):
+    def _drain_ai_queue(self):
         try:
             while True:
                 kind, payload = self.ai_queue.get_nowait()
+                self.board_view.busy = False
                 if kind == "move":
                     uci = payload.get("move")
                     mv = chess.Move.from_uci(uci)
                     piece = self.game.board.piece_at(mv.from_square)
                     if not piece:
                         if uci and self.game.apply_uci(uci):
-                            self.board_view.redraw()
+                            self.board_view.schedule_redraw()
                             self.status_var.set(self.game.status_text())
                         continue
                     code = ('w' if piece.color == chess.WHITE else 'b') + piece.symbol().upper()
 
                     def commit_ai():
                         if uci and self.game.apply_uci(uci):
-                            self.board_view.redraw()
+                            self.board_view.schedule_redraw()
                             self.status_var.set(self.game.status_text())
                             if self.game.is_game_over():
                                 messagebox.showinfo("Game Over", self.game.status_text())
@@ -212,5 +237,3 @@ class ChessApp(tk.Tk):
                     messagebox.showerror("AI Error", f"{msg}\n{detail}")
         except queue.Empty:
             pass
-        finally:
-            self.after(80, self._poll_ai)
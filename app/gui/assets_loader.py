@@ -1,28 +1,63 @@
 from __future__ import annotations
+import os
+import weakref
 from pathlib import Path
 import tkinter as tk
 
 PIECE_CODES = ["wP","wN","wB","wR","wQ","wK","bP","bN","bB","bR","bQ","bK"]
 
 class Assets:
-    def __init__(self, images: dict[str, tk.PhotoImage], sq_size: int):
+    def __init__(self, images: dict[str, tk.PhotoImage], sq_size: int, master: tk.Misc | None = None):
         self.images = images
         self.sq_size = sq_size
+        # the interpreter, not the widget: a ref to the widget would pin its _cache entry
+        self._tk = getattr(master, "tk", None)
+        # (square colour, piece code or None) -> pre-composited square tile
+        self.tiles: dict[tuple[str, str | None], tk.PhotoImage] = {}
 
     def img(self, code: str) -> tk.PhotoImage:
         return self.images[code]
 
-def load_piece_images(project_root: Path, sq_size: int) -> Assets:
+    def tile(self, bg: str, code: str | None = None) -> tk.PhotoImage:
+        """Square-sized image of `bg` with piece `code` alpha-blended on top, built once."""
+        key = (bg, code)
+        t = self.tiles.get(key)
+        if t is None:
+            n = self.sq_size
+            t = tk.PhotoImage(master=self._tk, width=n, height=n)
+            t.put(bg, to=(0, 0, n, n))
+            if code is not None:
+                # photo copy overlays using the piece's alpha channel
+                t.tk.call(t, "copy", self.images[code], "-to", 0, 0)
+            self.tiles[key] = t
+        return t
+
+# PhotoImages belong to one Tk interpreter: cached per master widget, dropped with it
+_cache: "weakref.WeakKeyDictionary[tk.Misc, dict[tuple, Assets]]" = weakref.WeakKeyDictionary()
+
+def load_piece_images(project_root: Path, sq_size: int, master: tk.Misc) -> Assets:
     base = project_root / "assets" / "png" / str(sq_size)
+    key = (str(base), sq_size)
+    per_master = _cache.get(master)
+    if per_master is None:
+        per_master = _cache[master] = {}
+    cached = per_master.get(key)
+    if cached is not None:
+        return cached
+    try:
+        existing = {e.name for e in os.scandir(base)}
+    except FileNotFoundError:
+        existing = set()
     images: dict[str, tk.PhotoImage] = {}
     missing = []
     for code in PIECE_CODES:
-        p = base / f"{code}.png"
-        if not p.exists():
-            missing.append(str(p))
+        name = f"{code}.png"
+        if name not in existing:
+            missing.append(str(base / name))
             continue
-        img = tk.PhotoImage(file=str(p))
+        img = tk.PhotoImage(master=master, file=str(base / name))
         images[code] = img
     if missing:
         raise FileNotFoundError("Missing piece images:\n" + "\n".join(missing))
-    return Assets(images, sq_size)
+    assets = per_master[key] = Assets(images, sq_size, master)
+    return assets
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import time
 import tkinter as tk
 import chess
 from typing import Optional, Set, Callable
@@ -11,6 +12,18 @@ DARK_COLOR  = "#769656"
 HL_MOVE_FROM = "#F6F669"
 HL_MOVE_TO   = "#BACA2B"
 HL_LEGAL     = "#f1e57a"
+ANIM_FRAME_S = 0.016  # animation tick target (~60 Hz)
+DRAG_START_PX = 4      # pointer travel that turns a press into a drag
+
+# hot-path aliases (skip module attribute lookups per call)
+_sq_rank = chess.square_rank
+_Move = chess.Move
+_QUEEN = chess.QUEEN
+_WHITE = chess.WHITE
+_BB_SQUARES = chess.BB_SQUARES
+# asset code by piece type, e.g. _CODES_WHITE[chess.KNIGHT] == "wN"
+_CODES_WHITE = (None,) + tuple("w" + chess.piece_symbol(pt).upper() for pt in chess.PIECE_TYPES)
+_CODES_BLACK = (None,) + tuple("b" + chess.piece_symbol(pt).upper() for pt in chess.PIECE_TYPES)
 
 
 class BoardView(tk.Canvas):
@@ -25,119 +38,255 @@ class BoardView(tk.Canvas):
         self.sq_size = sq_size
         self.flipped = flipped
         self.on_user_move = on_user_move
+        self._build_xy_tables()
 
         self.selected_sq: Optional[int] = None
         self.legal_targets: Set[int] = set()
 
         # Drag state
+        self._press_sq: Optional[int] = None
+        self._press_xy = (0, 0)
+        self._press_can_drag = False
         self.drag_from_sq: Optional[int] = None
-        self.drag_img_id: Optional[int] = None
         self.drag_code: Optional[str] = None
+        self._drag_half = (0, 0)  # half image size, read once per drag
+        self._pending_motion: Optional[tuple[int, int]] = None
+        self._motion_scheduled = False
+        self._redraw_scheduled = False
+
+        # Set by the app while the engine thinks; input is ignored, not queued
+        self.busy: bool = False
 
         # Animation state
         self.animating: bool = False
         self.anim_from_sq: Optional[int] = None
         self.anim_to_sq: Optional[int] = None
-        self.anim_img_id: Optional[int] = None
         self.anim_code: Optional[str] = None
+        self._anim_after_id: Optional[str] = None
 
         # Input bindings
-        self.bind("<Button-1>", self._on_click)          # click-click
-        self.bind("<ButtonPress-1>", self._on_press)     # drag start
+        self.bind("<ButtonPress-1>", self._on_press)     # click or drag start
         self.bind("<B1-Motion>", self._on_motion)        # dragging
-        self.bind("<ButtonRelease-1>", self._on_release) # drop
+        self.bind("<ButtonRelease-1>", self._on_release) # click or drop
 
+        self._build_items()
         self.redraw()
 
     # ---- Draw ----
+    # Canvas items are created once; redraws only reconfigure what changed.
+    # The 64 squares live in one board-sized PhotoImage that tiles are blitted into.
+    def _build_items(self):
+        n = self.sq_size
+        self._sq_color = [LIGHT_COLOR if (chess.square_file(sq) + chess.square_rank(sq)) % 2 == 0
+                          else DARK_COLOR for sq in chess.SQUARES]
+        self._sq_keys: list = [None] * 64  # tile key currently blitted per square
+        # empty checkerboard, painted once; the pattern is the same when flipped
+        self._board_bg = tk.PhotoImage(width=n*8, height=n*8)
+        self._board_bg.put(LIGHT_COLOR, to=(0, 0, n*8, n*8))
+        for r in range(8):
+            for f in range(r % 2, 8, 2):
+                self._board_bg.put(DARK_COLOR, to=(f*n, r*n, (f+1)*n, (r+1)*n))
+        self._board_img = tk.PhotoImage(width=n*8, height=n*8)
+        self._board_id = self.create_image(self.padding, self.padding, image=self._board_img, anchor="nw")
+        self._clear_board_image()
+        self._hl_from_id = self.create_rectangle(0, 0, n, n, outline=HL_MOVE_FROM, width=3,
+                                                 state="hidden", tags=("hl",))
+        self._hl_to_id = self.create_rectangle(0, 0, n, n, outline=HL_MOVE_TO, width=3,
+                                               state="hidden", tags=("hl",))
+        self._sel_id = self.create_rectangle(0, 0, n, n, outline="#e0c53b", width=3,
+                                             state="hidden", tags=("hl",))
+        # 27 = most targets one piece can have (centralised queen)
+        self._dot_ids = [self.create_oval(0, 0, 0, 0, fill=HL_LEGAL, outline="", state="hidden",
+                                          tags=("legal",)) for _ in range(27)]
+        # animation sprite, kept hidden between moves; created last so it stays on top
+        self.anim_img_id = self.create_image(0, 0, anchor="nw", state="hidden")
+        self.drag_img_id = self.create_image(0, 0, anchor="nw", state="hidden")
+        self._placed: dict[int, Optional[int]] = {}  # highlight item -> square it marks
+        self._dots_key = None
+        self._dirty: set[int] = set()
+        self._drawn_key = None  # GameState.position_key() of the last full scan
+
+    def schedule_redraw(self):
+        """Coalesce invalidations: redraw once when the event loop goes idle."""
+        if not self._redraw_scheduled:
+            self._redraw_scheduled = True
+            self.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_scheduled = False
+        self.redraw()
+
     def redraw(self):
-        self.delete("all")
-        self._draw_board()
-        self._draw_highlights()
-        self._draw_pieces()
-        # animation overlay는 별도로 관리(필요 시 재생성)
+        """Full refresh; squares are only rescanned when the position changed."""
+        key = self.game.position_key()
+        if key != self._drawn_key:
+            self._drawn_key = key
+            self._dirty.update(chess.SQUARES)
+        self._flush()
+
+    def _mark_dirty(self, *squares: Optional[int]):
+        self._dirty.update(sq for sq in squares if sq is not None)
+
+    def _flush(self):
+        # repaint only invalidated squares; highlights are separate items
+        if self._dirty:
+            board = self.game.board
+            white = board.occupied_co[_WHITE]
+            repaint = self._repaint_square
+            for sq in self._dirty:
+                repaint(sq, board, white)
+            self._dirty.clear()
+        self._sync_highlights()
+        # animation/drag overlay는 별도로 관리
+
+    def _repaint_square(self, sq: int, board: chess.Board, white: int):
+        key = (self._sq_color[sq], self._piece_code_at(sq, board, white))
+        if key != self._sq_keys[sq]:
+            x, y = self._xy[sq]
+            img = self._board_img
+            img.tk.call(img, "copy", self.assets.tile(*key), "-to", x - self.padding, y - self.padding,
+                        "-compositingrule", "set")
+            self._sq_keys[sq] = key
+
+    def _piece_code_at(self, sq: int, board: chess.Board, white: int) -> Optional[str]:
+        # Hide squares involved in drag/animation
+        if self.drag_from_sq is not None and sq == self.drag_from_sq:
+            return None
+        if self.animating and (sq == self.anim_from_sq or sq == self.anim_to_sq):
+            return None
+        piece_type = board.piece_type_at(sq)
+        if piece_type is None:
+            return None
+        return (_CODES_WHITE if _BB_SQUARES[sq] & white else _CODES_BLACK)[piece_type]
 
-    def _draw_board(self):
-        for r in range(8):
-            for f in range(8):
-                color = LIGHT_COLOR if (r+f) % 2 == 0 else DARK_COLOR
-                sq = self._fr_to_square(f, r)
-                x, y = self._sq_to_xy(sq)
-                self.create_rectangle(x, y, x+self.sq_size, y+self.sq_size, fill=color, outline=color)
+    def _place_square_rect(self, item: int, sq: Optional[int]):
+        if self._placed.get(item, -1) == sq:
+            return
+        self._placed[item] = sq
+        if sq is None:
+            self.itemconfigure(item, state="hidden")
+            return
+        x, y = self._sq_to_xy(sq)
+        self.coords(item, x, y, x+self.sq_size, y+self.sq_size)
+        self.itemconfigure(item, state="normal")
 
-    def _draw_highlights(self):
+    def _sync_highlights(self):
         last = self.game.last_move
-        if last:
-            for sq, clr in [(last.from_square, HL_MOVE_FROM), (last.to_square, HL_MOVE_TO)]:
-                x, y = self._sq_to_xy(sq)
-                self.create_rectangle(x, y, x+self.sq_size, y+self.sq_size, outline=clr, width=3)
-
-        if self.selected_sq is not None:
-            x, y = self._sq_to_xy(self.selected_sq)
-            self.create_rectangle(x, y, x+self.sq_size, y+self.sq_size, outline="#e0c53b", width=3)
-            for tgt in self.legal_targets:
-                tx, ty = self._sq_to_xy(tgt)
-                self.create_oval(tx+self.sq_size*0.4, ty+self.sq_size*0.4,
-                                 tx+self.sq_size*0.6, ty+self.sq_size*0.6,
-                                 fill=HL_LEGAL, outline="")
-
-    def _draw_pieces(self):
-        pm = self.game.piece_map()
-        for sq, piece in pm.items():
-            # Hide squares involved in drag/animation
-            if self.drag_from_sq is not None and sq == self.drag_from_sq:
-                continue
-            if self.animating and (sq == self.anim_from_sq or sq == self.anim_to_sq):
-                continue
-            code = ("w" if piece.color == chess.WHITE else "b") + piece.symbol().upper()
-            x, y = self._sq_to_xy(sq)
-            self.create_image(x, y, image=self.assets.img(code), anchor="nw")
+        self._place_square_rect(self._hl_from_id, last.from_square if last else None)
+        self._place_square_rect(self._hl_to_id, last.to_square if last else None)
+        self._place_square_rect(self._sel_id, self.selected_sq)
+
+        targets = frozenset(self.legal_targets) if self.selected_sq is not None else frozenset()
+        key = (targets, self._xy)
+        if key == self._dots_key:
+            return
+        self._dots_key = key
+        self.itemconfigure("legal", state="hidden")  # one tag call hides the whole pool
+        lo, hi = self.sq_size*0.4, self.sq_size*0.6
+        xy = self._xy
+        for dot, tgt in zip(self._dot_ids, targets):
+            tx, ty = xy[tgt]
+            self.coords(dot, tx+lo, ty+lo, tx+hi, ty+hi)
+            self.itemconfigure(dot, state="normal")
+
+    def _clear_board_image(self):
+        # one copy of the background instead of 64 empty-square blits
+        img = self._board_img
+        img.tk.call(img, "copy", self._board_bg, "-compositingrule", "set")
+        self._sq_keys = [(color, None) for color in self._sq_color]
+
+    def _relayout(self):
+        # square → screen position changed (flip); re-blit every piece
+        self._clear_board_image()
+        self._drawn_key = None
+        self._placed.clear()
+        self.redraw()
 
     # ---- Mapping ----
-    def _sq_to_xy(self, sq: int):
-        f = chess.square_file(sq)
-        r = chess.square_rank(sq)
+    def _build_xy_tables(self):
+        p, n = self.padding, self.sq_size
+        self._xy_normal = tuple((p + chess.square_file(sq)*n, p + (7-chess.square_rank(sq))*n)
+                                for sq in chess.SQUARES)
+        self._xy_flipped = tuple((p + (7-chess.square_file(sq))*n, p + chess.square_rank(sq)*n)
+                                 for sq in chess.SQUARES)
+        # screen cell (row_from_top*8 + file) -> square
+        self._hit_normal = tuple(chess.square(i % 8, 7 - i // 8) for i in range(64))
+        self._hit_flipped = tuple(chess.square(7 - i % 8, i // 8) for i in range(64))
+        self._board_px = n * 8
+        self._specialize_mapping()
+
+    def _specialize_mapping(self):
+        # Rebind the mapping helpers per orientation so no call branches on self.flipped
         if self.flipped:
-            f = 7 - f
-            r = 7 - r
-        x = self.padding + f*self.sq_size
-        y = self.padding + (7-r)*self.sq_size
-        return x, y
+            self._xy, self._hit = self._xy_flipped, self._hit_flipped
+        else:
+            self._xy, self._hit = self._xy_normal, self._hit_normal
+        self._sq_to_xy = self._xy.__getitem__  # sq -> (x, y) of its top-left corner
 
     def _xy_to_square(self, x: int, y: int):
-        if x < self.padding or y < self.padding:
-            return None
-        f = (x - self.padding) // self.sq_size
-        r_from_top = (y - self.padding) // self.sq_size
-        if f < 0 or f >= 8 or r_from_top < 0 or r_from_top >= 8:
+        dx, dy = x - self.padding, y - self.padding
+        size = self._board_px
+        if (dx | dy) < 0 or dx >= size or dy >= size:
             return None
-        rank_idx = 7 - r_from_top
-        file_idx = f
-        if self.flipped:
-            file_idx = 7 - file_idx
-            rank_idx = 7 - rank_idx
-        return chess.square(file_idx, rank_idx)
-
-    def _fr_to_square(self, file_idx, rank_idx):
-        if self.flipped:
-            file_idx = 7 - file_idx
-            rank_idx = 7 - rank_idx
-        return chess.square(file_idx, rank_idx)
-
-    # ---- Click→Click ----
-    def _on_click(self, event):
-        if self.animating or self.game.is_game_over():
+        n = self.sq_size
+        return self._hit[(dy // n) * 8 + dx // n]
+
+    def _move_uci(self, from_sq: int, to_sq: int) -> str:
+        # legal_move_set() is cached per position: O(1) membership, no regeneration
+        mv = _Move(from_sq, to_sq)
+        if mv not in self.game.legal_move_set():
+            if (_sq_rank(from_sq) in (6,1) and _sq_rank(to_sq) in (7,0)):
+                mv = _Move(from_sq, to_sq, promotion=_QUEEN)
+        return mv.uci()
+
+    # ---- Press → click or drag ----
+    # One press/release pair per tap: a release without DRAG_START_PX of travel
+    # is a click on the pressed square, otherwise the motion lifted the piece.
+    def _on_press(self, event):
+        if self.animating or self.busy or self.game.is_game_over():
             return
         sq = self._xy_to_square(event.x, event.y)
         if sq is None:
             return
+        self._press_xy = (event.x, event.y)
+        self._press_sq = sq
+        # decided once here, so motion over an empty/enemy square costs nothing
+        piece = self.game.board.piece_at(sq)
+        self._press_can_drag = piece is not None and piece.color == self.game.board.turn
+
+    def _on_motion(self, event):
+        if self.drag_from_sq is None:
+            if self._press_sq is None or not self._press_can_drag:
+                return
+            px, py = self._press_xy
+            if abs(event.x - px) <= DRAG_START_PX and abs(event.y - py) <= DRAG_START_PX:
+                return
+            self._begin_drag(self._press_sq)
+        # keep only the latest position; one coords() per idle cycle
+        self._pending_motion = (event.x, event.y)
+        if not self._motion_scheduled:
+            self._motion_scheduled = True
+            self.after_idle(self._flush_motion)
+
+    def _on_release(self, event):
+        press_sq, self._press_sq = self._press_sq, None
+        if self.drag_from_sq is None:
+            if press_sq is not None:
+                self._click_square(press_sq)
+            return
+        self._drop(self._xy_to_square(event.x, event.y))
+
+    # ---- Click→Click ----
+    def _click_square(self, sq: int):
+        if self.animating or self.busy or self.game.is_game_over():
+            return
         piece = self.game.board.piece_at(sq)
 
         # 선택 토글: 같은 칸 다시 클릭하면 해제만 하고 종료
         if self.selected_sq is not None and sq == self.selected_sq:
             self.selected_sq = None
             self.legal_targets.clear()
-            self.redraw()
+            self._flush()
             return
 
         if self.selected_sq is None:
@@ -145,99 +294,77 @@ class BoardView(tk.Canvas):
                 return
             self.selected_sq = sq
             self.legal_targets = self.game.legal_moves_from(sq)
-            self.redraw()
+            self._flush()
         else:
             # 다른 칸 클릭 → 이동 시도
-            mv = chess.Move(self.selected_sq, sq)
-            uci = mv.uci()
-            if mv not in self.game.board.legal_moves:
-                if (chess.square_rank(self.selected_sq) in (6,1) and chess.square_rank(sq) in (7,0)):
-                    uci = chess.Move(self.selected_sq, sq, promotion=chess.QUEEN).uci()
+            uci = self._move_uci(self.selected_sq, sq)
             if self.on_user_move and self.selected_sq != sq:
                 self.on_user_move(uci)
             # selection reset
             self.selected_sq = None
             self.legal_targets.clear()
-            self.redraw()
+            self._flush()
 
     # ---- Drag & Drop ----
-    def _on_press(self, event):
-        if self.animating or self.game.is_game_over():
-            return
-        sq = self._xy_to_square(event.x, event.y)
-        if sq is None:
-            return
+    def _begin_drag(self, sq: int):
         piece = self.game.board.piece_at(sq)
-        if piece is None or piece.color != self.game.board.turn:
-            return
-
         self.drag_from_sq = sq
-        self.drag_code = ("w" if piece.color == chess.WHITE else "b") + piece.symbol().upper()
+        self.drag_code = (_CODES_WHITE if piece.color == _WHITE else _CODES_BLACK)[piece.piece_type]
 
         # 드래그 시작 시 마커 유지
         self.selected_sq = sq
         self.legal_targets = self.game.legal_moves_from(sq)
 
         # 먼저 원본을 숨기고
-        self.redraw()
-        # 오버레이 생성
+        self._mark_dirty(sq)
+        self._flush()
+        # 오버레이 표시 (the item is reused; _flush_motion positions it)
         img = self.assets.img(self.drag_code)
-        self.drag_img_id = self.create_image(event.x - img.width()//2,
-                                             event.y - img.height()//2,
-                                             image=img, anchor="nw")
-
-    def _on_motion(self, event):
-        if self.drag_img_id is None:
-            return
-        img = self.assets.img(self.drag_code) if self.drag_code else None
-        if img:
-            self.coords(self.drag_img_id, event.x - img.width()//2, event.y - img.height()//2)
-
-    def _on_release(self, event):
-        if self.drag_from_sq is None:
+        self._drag_half = img.width()//2, img.height()//2
+        self.itemconfigure(self.drag_img_id, image=img, state="normal")
+        self.tag_raise(self.drag_img_id)
+
+    def _flush_motion(self):
+        self._motion_scheduled = False
+        pos, self._pending_motion = self._pending_motion, None
+        if pos is None or self.drag_from_sq is None:
             return
+        hw, hh = self._drag_half
+        self.coords(self.drag_img_id, pos[0] - hw, pos[1] - hh)
 
-        # 오버레이 제거
-        if self.drag_img_id is not None:
-            try:
-                self.delete(self.drag_img_id)
-            except Exception:
-                pass
-        self.drag_img_id = None
+    def _drop(self, to_sq: Optional[int]):
+        # 오버레이 숨김
+        self.itemconfigure(self.drag_img_id, state="hidden")
+        self._pending_motion = None
 
-        to_sq = self._xy_to_square(event.x, event.y)
         from_sq = self.drag_from_sq
 
         # drag state 해제는 항상 선행(예외/리턴에도 안전)
         self.drag_from_sq = None
         self.drag_code = None
+        self._mark_dirty(from_sq)  # un-hide the source square
 
         # 드롭이 보드 밖이거나 같은 칸이면 → 이동 취소(선택 유지/토글)
         if to_sq is None:
             self.selected_sq = None
             self.legal_targets.clear()
-            self.redraw()
+            self._flush()
             return
 
         if to_sq == from_sq:
             # 같은 칸 드롭: 선택만 유지(토글하려면 한 번 더 클릭)
             self.selected_sq = from_sq
             self.legal_targets = self.game.legal_moves_from(from_sq)
-            self.redraw()
+            self._flush()
             return
 
-        mv = chess.Move(from_sq, to_sq)
-        uci = mv.uci()
-        if mv not in self.game.board.legal_moves:
-            if (chess.square_rank(from_sq) in (6,1) and chess.square_rank(to_sq) in (7,0)):
-                uci = chess.Move(from_sq, to_sq, promotion=chess.QUEEN).uci()
-
+        uci = self._move_uci(from_sq, to_sq)
         if self.on_user_move:
             self.on_user_move(uci)
 
         self.selected_sq = None
         self.legal_targets.clear()
-        self.redraw()
+        self._flush()
 
     # ---- Animation ----
     def animate_move(self, piece_code: str, from_sq: int, to_sq: int,
@@ -253,41 +380,63 @@ class BoardView(tk.Canvas):
         end_x, end_y = self._sq_to_xy(to_sq)
         img = self.assets.img(piece_code)
 
-        self.redraw()
-        self.anim_img_id = self.create_image(start_x, start_y, image=img, anchor="nw")
+        self._mark_dirty(from_sq, to_sq)
+        self._flush()
+        self.coords(self.anim_img_id, start_x, start_y)
+        self.itemconfigure(self.anim_img_id, image=img, state="normal")
 
-        steps = max(int(duration_ms / 16), 8)
-        dx = (end_x - start_x) / steps
-        dy = (end_y - start_y) / steps
+        # position follows the wall clock, so slow ticks don't stretch the animation
+        t0 = time.perf_counter()
+        duration = max(duration_ms, 1) / 1000
+        dx, dy = end_x - start_x, end_y - start_y
 
-        def step(i=0):
-            if self.anim_img_id is None:
+        def step():
+            self._anim_after_id = None
+            if not self.animating:
                 return
-            self.move(self.anim_img_id, dx, dy)
-            if i + 1 < steps:
-                self.after(16, step, i+1)
+            elapsed = time.perf_counter() - t0
+            p = min(1.0, elapsed / duration)
+            self.coords(self.anim_img_id, start_x + dx*p, start_y + dy*p)
+            if p < 1.0:
+                # aim at the next frame boundary; late ticks skip ahead instead of queueing up
+                next_t = (int(elapsed / ANIM_FRAME_S) + 1) * ANIM_FRAME_S
+                delay = max(1, int((next_t - elapsed) * 1000))
+                self._anim_after_id = self.after(delay, step)
             else:
-                self.coords(self.anim_img_id, end_x, end_y)
-                try:
-                    self.delete(self.anim_img_id)
-                except Exception:
-                    pass
-                self.anim_img_id = None
+                from_sq, to_sq = self.anim_from_sq, self.anim_to_sq
                 self.animating = False
                 self.anim_from_sq = None
                 self.anim_to_sq = None
                 self.anim_code = None
+                # commit first, then repaint synchronously under the sprite: flushing
+                # before done() would draw a frame of the pre-move position
                 if done:
                     done()
-
-        self.after(16, step)
+                self._mark_dirty(from_sq, to_sq)
+                self.redraw()
+                if not self.animating:  # done() may have started the reply's animation
+                    self.itemconfigure(self.anim_img_id, state="hidden")
+
+        self._anim_after_id = self.after(int(ANIM_FRAME_S * 1000), step)
+
+    def cancel_animation(self):
+        """Stop a running animation without calling its done callback."""
+        if self._anim_after_id is not None:
+            self.after_cancel(self._anim_after_id)
+            self._anim_after_id = None
+        if self.animating:
+            self.itemconfigure(self.anim_img_id, state="hidden")
+            self.animating = False
+            self._mark_dirty(self.anim_from_sq, self.anim_to_sq)
+            self.anim_from_sq = self.anim_to_sq = self.anim_code = None
+            self._flush()
 
     # ---- Helpers ----
     def set_flipped(self, flipped: bool):
         self.flipped = flipped
-        self.redraw()
+        self._specialize_mapping()
+        self._relayout()
 
     def set_bottom(self, color: str):
         """color ∈ {"white","black"} — ensure that color is at the bottom."""
-        self.flipped = (color.lower() == "black")
-        self.redraw()
+        self.set_flipped(color.lower() == "black")
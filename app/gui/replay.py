@@ -50,91 +50,104 @@ class ReplayPanel(ttk.Frame):
         self.listbox.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=4, pady=(0, 4))
         self.listbox.bind("<Double-Button-1>", self._on_dblclick)
 
+        # redraw batching across a jump
+        self._in_batch = 0
+        self._pending_redraw = False
+
+        # what the listbox currently shows (for incremental refresh)
+        self._rendered_rows: List[str] = []
+        self._rendered_cursor: Optional[int] = None
+        # set while hidden; the list is brought up to date on <Map>
+        self._list_dirty = False
+        self.bind("<Map>", self._on_map)
+
         # history change binding
         self.history.bind_on_change(self._on_history_change)
-        self._refresh_list()
+        self._request_list()
 
     # external rebind when board object is replaced
     def rebind(self, new_board) -> None:
         self.board = new_board
-        self._refresh_list()
+        self._request_list()
 
     # buttons
     def _goto_first(self):
-        self._busy(True)
-        try:
-            self.history.first(self.board)
-            self._redraw()
-            self._on_jump()
-        finally:
-            self._busy(False)
+        self._jump(lambda: self.history.first(self.board))
 
     def _goto_last(self):
-        self._busy(True)
-        try:
-            self.history.last(self.board)
-            self._redraw()
-            self._on_jump()
-        finally:
-            self._busy(False)
+        self._jump(lambda: self.history.last(self.board))
 
     def _goto_prev(self):
-        self._busy(True)
-        try:
-            self.history.prev(self.board)
-            self._redraw()
-            self._on_jump()
-        finally:
-            self._busy(False)
+        self._jump(lambda: self.history.prev(self.board))
 
     def _goto_next(self):
-        self._busy(True)
-        try:
-            self.history.next(self.board)
-            self._redraw()
-            self._on_jump()
-        finally:
-            self._busy(False)
+        self._jump(lambda: self.history.next(self.board))
 
     # double-click jump (row → ply = row*2+2)
     def _on_dblclick(self, ev):
         row = self.listbox.nearest(ev.y)
         target = min(self.history.total, row * 2 + 2)
+        self._jump(lambda: self.history.goto(self.board, target))
+
+    def _jump(self, go: Callable[[], None]) -> None:
+        # history fires on_change mid-jump; batch so the board is painted once
         self._busy(True)
         try:
-            self.history.goto(self.board, target)
-            self._redraw()
+            self._in_batch += 1
+            try:
+                go()
+            finally:
+                self._in_batch -= 1
+            if self._in_batch == 0:
+                self._pending_redraw = False
+                self._redraw()
+            else:
+                self._pending_redraw = True
             self._on_jump()
         finally:
             self._busy(False)
 
     # UI refresh on history changes
     def _on_history_change(self, cursor: int, total: int):
-        self._refresh_list()
-        self._redraw()
+        self._request_list()
+        if self._in_batch:
+            self._pending_redraw = True
+        else:
+            self._redraw()
 
-    def _refresh_list(self):
-        self.listbox.delete(0, tk.END)
-        rows: List[str] = []
-        moves = self.history.moves()
-
-        i = 0
-        move_no = 1
-        while i < len(moves):
-            left = moves[i].san
-            right = moves[i + 1].san if i + 1 < len(moves) else ""
-            rows.append(f"{move_no}. {left}  {right}".rstrip())
-            move_no += 1
-            i += 2
-
-        for r in rows:
-            self.listbox.insert(tk.END, r)
+    def _request_list(self) -> None:
+        self._list_dirty = True
+        if self.winfo_ismapped():
+            self._refresh_list()
+
+    def _on_map(self, _ev=None) -> None:
+        if self._list_dirty:
+            self._refresh_list()
 
+    def _refresh_list(self):
+        self._list_dirty = False
+        rows = self.history.rows()
         current = self.history.cursor
+        old = self._rendered_rows
+        if rows == old and current == self._rendered_cursor:
+            return
+
+        # only rewrite from the first row that differs (usually just the tail)
+        first = 0
+        limit = min(len(rows), len(old))
+        while first < limit and rows[first] == old[first]:
+            first += 1
+        if first < len(old):
+            self.listbox.delete(first, tk.END)
+        if first < len(rows):
+            self.listbox.insert(tk.END, *rows[first:])
+        self._rendered_rows = rows
+
         row_idx = max(0, (current - 1) // 2) if current > 0 else 0
-        if self.listbox.size() > 0:
+        if rows:
             self.listbox.selection_clear(0, tk.END)
             self.listbox.activate(row_idx)
             self.listbox.selection_set(row_idx)
+        self._rendered_cursor = current
 
         self.lbl_status.config(text=f"{self.history.cursor} / {self.history.total}")
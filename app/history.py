@@ -1,11 +1,14 @@
 from __future__ import annotations
+import sys
+from array import array
+from bisect import bisect_right, insort
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
-import copy
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 State = Any
 
-@dataclass
+@dataclass(slots=True, frozen=True)  # one per ply: no per-instance __dict__
 class MoveMeta:
     san: str
     from_sq: str
@@ -15,73 +18,262 @@ class MoveMeta:
     is_castle: bool = False
     is_enpassant: bool = False
 
+def _identity(state: State) -> State:
+    return state
+
+# ----------------------------
+#  16-bit move codes: from:6 | to:6 | promotion:3 | flag:1 (unused)
+# ----------------------------
+_SQUARES = tuple(f + r for r in "12345678" for f in "abcdefgh")
+_SQ_INDEX = {name: i for i, name in enumerate(_SQUARES)}
+_PROMOS = (None, "N", "B", "R", "Q")
+_PROMO_INDEX = {p: i for i, p in enumerate(_PROMOS)}
+UNPACKED = 0xFFFF  # flag bit set: never a real code; the move is kept as a MoveMeta
+
+def pack_move(from_sq: str, to_sq: str, promotion: Optional[str] = None) -> int:
+    """"e2","e4" -> 16-bit code; UNPACKED if a square/promotion isn't a plain one."""
+    f = _SQ_INDEX.get(from_sq)
+    t = _SQ_INDEX.get(to_sq)
+    p = _PROMO_INDEX.get(promotion)
+    if f is None or t is None or p is None:
+        return UNPACKED
+    return f | (t << 6) | (p << 12)
+
+def unpack_move(code: int) -> Tuple[str, str, Optional[str]]:
+    return _SQUARES[code & 63], _SQUARES[(code >> 6) & 63], _PROMOS[(code >> 12) & 7]
+
 class MoveHistory:
-    """Linear timeline with snapshot stride for fast random access."""
+    """Linear timeline with snapshot stride for fast random access.
+
+    Snapshots (stride points and jump targets) live in a small LRU; the
+    initial position is pinned, anything else is rebuilt by replaying moves.
+    With storage="packed" (default) moves are stored as 16-bit codes plus
+    interned SAN; MoveMeta objects are only built when a move is read through
+    moves() or replayed without `apply_packed`. storage="meta" keeps every
+    MoveMeta as pushed (e.g. to retain captured/castle flags).
+
+    Boards with a move stack (python-chess) pass `stack_depth`: jumps then
+    walk the live stack in place (undo_move back, apply forward), and a full
+    restore replays from the initial snapshot, so the stack stays whole for
+    takebacks and PGN export. No intermediate snapshots are taken for them.
+    """
     def __init__(
         self,
         get_state: Callable[[Any], State],
         set_state: Callable[[Any, State], None],
         apply_move: Callable[[Any, MoveMeta], None],
-        snapshot_stride: int = 8
+        snapshot_stride: int = 8,
+        snapshot_copier: Optional[Callable[[State], State]] = None,
+        max_cached_snapshots: int = 16,
+        undo_move: Optional[Callable[[Any, MoveMeta], bool]] = None,
+        storage: str = "packed",
+        apply_packed: Optional[Callable[[Any, int], None]] = None,
+        stack_depth: Optional[Callable[[Any], int]] = None,
     ):
+        if storage not in ("packed", "meta"):
+            raise ValueError(f"unknown storage: {storage!r}")
         self.get_state = get_state
         self.set_state = set_state
         self.apply_move = apply_move
+        # only mutable states need copying; immutable ones (FEN str) are stored as-is
+        self.copy_state = snapshot_copier or _identity
+        # native one-ply undo for "prev"; returns False when it can't undo that move
+        self.undo_move = undo_move
+        # replays a packed move straight from its code (skips the MoveMeta round trip)
+        self.apply_packed = apply_packed
+        self.storage = storage
+        # len(board.move_stack) for stack boards; see the class docstring
+        self.stack_depth = stack_depth
+        self._stack_base = 0  # stack depth at reset(): moves made before the history began
         self.snapshot_stride = max(1, snapshot_stride)
-        self._moves: List[MoveMeta] = []
-        self._snapshots: Dict[int, State] = {}
+        self.max_cached_snapshots = max(1, max_cached_snapshots)
+        self._codes = array("H")  # pack_move() code per ply
+        self._sans: List[str] = []  # SAN per ply, interned
+        self._odd: Dict[int, MoveMeta] = {}  # ply -> move that doesn't fit a code (UNPACKED)
+        self._rows: List[str] = []  # "N. white  black" per full move, kept in step with the moves
+        self._snapshots: "OrderedDict[int, State]" = OrderedDict()  # ply -> state, LRU order
+        self._snap_keys: List[int] = []  # the same plies, sorted (bisect lookup in goto)
         self._cursor: int = 0
         self._on_change: Optional[Callable[[int, int], None]] = None
+        self._replaying = False  # set while goto() re-applies recorded moves
+        self._moves_version = 0  # bumped whenever the recorded moves change
+        self._moves_view: tuple = ()
+        self._moves_view_version = 0
 
     def bind_on_change(self, cb: Callable[[int, int], None]) -> None:
         self._on_change = cb
 
     def _fire(self) -> None:
         if self._on_change:
-            self._on_change(self._cursor, len(self._moves))
+            self._on_change(self._cursor, len(self._sans))
 
     def reset(self, board: Any) -> None:
-        self._moves.clear()
+        del self._codes[:]
+        self._sans.clear()
+        self._odd.clear()
+        self._moves_version += 1
+        self._rows.clear()
         self._snapshots.clear()
         self._cursor = 0
-        self._snapshots[0] = copy.deepcopy(self.get_state(board))
+        self._stack_base = self.stack_depth(board) if self.stack_depth is not None else 0
+        self._snapshots[0] = self.copy_state(self.get_state(board))
+        self._snap_keys[:] = [0]
         self._fire()
 
     def push(self, board: Any, move: MoveMeta) -> None:
+        code = UNPACKED
+        if self.storage == "packed" and move.captured is None \
+           and not move.is_castle and not move.is_enpassant:
+            code = pack_move(move.from_sq, move.to_sq, move.promotion)
+        self._append(board, code, move.san, move)
+
+    def push_packed(self, board: Any, code: int, san: str) -> None:
+        """push() for a move already encoded by pack_move(); no MoveMeta is built."""
+        if code == UNPACKED:
+            raise ValueError("push_packed() needs a packed move; use push()")
+        self._append(board, code, san, None)
+
+    def _append(self, board: Any, code: int, san: str, move: Optional[MoveMeta]) -> None:
+        if self._replaying:
+            return  # goto()'s own apply_move went through a recording wrapper
+        cur = self._cursor
+        if self.stack_depth is not None:
+            # the move is already on the stack; a takeback behind our back moves the branch point
+            ply = self.stack_depth(board) - self._stack_base - 1
+            if 0 <= ply <= len(self._sans):
+                cur = ply
         # 새 갈래가 열리면 꼬리 제거
-        if self._cursor < len(self._moves):
-            del self._moves[self._cursor:]
-            for k in list(self._snapshots.keys()):
-                if k > self._cursor:
-                    self._snapshots.pop(k, None)
-        self._moves.append(move)
-        self._cursor += 1
-        if self._cursor % self.snapshot_stride == 0:
-            self._snapshots[self._cursor] = copy.deepcopy(self.get_state(board))
+        if cur < len(self._sans):
+            del self._codes[cur:]
+            del self._sans[cur:]
+            if self._odd:
+                for k in [k for k in self._odd if k >= cur]:
+                    del self._odd[k]
+            self._truncate_rows(cur)
+            cut = bisect_right(self._snap_keys, cur)
+            for k in self._snap_keys[cut:]:
+                del self._snapshots[k]
+            del self._snap_keys[cut:]
+        san = sys.intern(san)
+        if code == UNPACKED:
+            self._odd[len(self._sans)] = move
+        self._codes.append(code)
+        self._sans.append(san)
+        self._moves_version += 1
+        n = len(self._sans)
+        if n % 2 == 1:
+            self._rows.append(f"{(n + 1) // 2}. {san}")
+        else:
+            self._rows[-1] = f"{self._rows[-1]}  {san}"
+        self._cursor = cur + 1
+        if self.stack_depth is None and self._cursor % self.snapshot_stride == 0:
+            self._remember(self._cursor, board)
         self._fire()
 
+    def _remember(self, index: int, board: Any) -> None:
+        snaps = self._snapshots
+        if index not in snaps:
+            insort(self._snap_keys, index)
+        snaps[index] = self.copy_state(self.get_state(board))
+        snaps.move_to_end(index)
+        while len(snaps) > self.max_cached_snapshots + 1:  # +1: pinned index 0
+            oldest = next(iter(snaps))
+            if oldest == 0:
+                snaps.move_to_end(0)
+            else:
+                del snaps[oldest]
+                del self._snap_keys[bisect_right(self._snap_keys, oldest) - 1]
+
     @property
     def cursor(self) -> int: return self._cursor
     @property
-    def total(self) -> int: return len(self._moves)
-    def moves(self) -> List[MoveMeta]: return list(self._moves)
+    def total(self) -> int: return len(self._sans)
+    def moves(self) -> Tuple[MoveMeta, ...]:
+        """Read-only view of the recorded moves; rebuilt only after a change."""
+        if self._moves_view_version != self._moves_version:
+            self._moves_view = tuple(self._meta(i) for i in range(len(self._sans)))
+            self._moves_view_version = self._moves_version
+        return self._moves_view
+
+    def _meta(self, ply: int) -> MoveMeta:
+        code = self._codes[ply]
+        if code == UNPACKED:
+            return self._odd[ply]
+        f, t, p = unpack_move(code)
+        return MoveMeta(san=self._sans[ply], from_sq=f, to_sq=t, promotion=p)
+    def rows(self) -> List[str]: return list(self._rows)
+
+    def _truncate_rows(self, n_moves: int) -> None:
+        del self._rows[(n_moves + 1) // 2:]
+        if n_moves % 2 == 1:
+            self._rows[-1] = f"{(n_moves + 1) // 2}. {self._sans[n_moves - 1]}"
 
     def goto(self, board: Any, target_index: int) -> None:
-        if not (0 <= target_index <= len(self._moves)):
+        if not (0 <= target_index <= len(self._sans)):
             raise IndexError(f"goto out of range: {target_index}")
-        if target_index == self._cursor:
+        cur = self._cursor
+        if target_index == cur:
             return
-        # 가장 가까운 이전 스냅샷부터 재적용
-        snap = max([i for i in self._snapshots.keys() if i <= target_index], default=0)
-        self.set_state(board, copy.deepcopy(self._snapshots[snap]))
-        for i in range(snap, target_index):
-            self.apply_move(board, self._moves[i])
+        # on_change fires once per jump, after the last replayed move
+        self._replaying = True
+        try:
+            if self.stack_depth is not None:
+                self._walk(board, cur, target_index)
+            # ±1 ply (next/prev buttons): step in place, no snapshot restore
+            elif target_index == cur + 1:
+                code = self._codes[cur]
+                if code != UNPACKED and self.apply_packed is not None:
+                    self.apply_packed(board, code)
+                else:
+                    self.apply_move(board, self._meta(cur))
+            elif not (target_index == cur - 1 and self.undo_move is not None
+                      and self.undo_move(board, self._meta(target_index))):
+                self._restore(board, target_index)
+        finally:
+            self._replaying = False
         self._cursor = target_index
         self._fire()
 
+    def _walk(self, board: Any, cur: int, target_index: int) -> None:
+        # stack boards: move along the live stack while it matches the cursor
+        if self.stack_depth(board) - self._stack_base != cur:
+            self._restore(board, target_index)  # e.g. a takeback we weren't told about
+            return
+        if target_index < cur:
+            undo_move, meta = self.undo_move, self._meta
+            for i in range(cur - 1, target_index - 1, -1):
+                if undo_move is None or not undo_move(board, meta(i)):
+                    self._restore(board, target_index)
+                    return
+            return
+        self._replay(board, cur, target_index)
+
+    def _restore(self, board: Any, target_index: int) -> None:
+        # 가장 가까운 이전 스냅샷부터 재적용
+        snap = self._snap_keys[bisect_right(self._snap_keys, target_index) - 1]
+        self._snapshots.move_to_end(snap)
+        self.set_state(board, self.copy_state(self._snapshots[snap]))
+        self._replay(board, snap, target_index)
+        if target_index != snap and self.stack_depth is None:
+            self._remember(target_index, board)  # jumping back here is then a plain restore
+
+    def _replay(self, board: Any, start: int, stop: int) -> None:
+        apply_move, meta = self.apply_move, self._meta
+        apply_packed, codes = self.apply_packed, self._codes
+        if apply_packed is not None and not self._odd:
+            for code in codes[start:stop]:  # array slice: plain ints, no objects
+                apply_packed(board, code)
+        else:
+            for i in range(start, stop):
+                code = codes[i]
+                if code != UNPACKED and apply_packed is not None:
+                    apply_packed(board, code)
+                else:
+                    apply_move(board, meta(i))
+
     def first(self, board: Any) -> None: self.goto(board, 0)
-    def last(self, board: Any) -> None: self.goto(board, len(self._moves))
+    def last(self, board: Any) -> None: self.goto(board, len(self._sans))
     def prev(self, board: Any) -> None:
         if self._cursor > 0: self.goto(board, self._cursor - 1)
     def next(self, board: Any) -> None:
-        if self._cursor < len(self._moves): self.goto(board, self._cursor + 1)
+        if self._cursor < len(self._sans): self.goto(board, self._cursor + 1)
@@ -1,61 +1,246 @@
 from __future__ import annotations
 
-import copy
-import tkinter as tk
-from typing import Any, Callable, Optional, Tuple
-
-from history import MoveHistory, MoveMeta
-from gui.replay import ReplayPanel
+import logging
+import pickle
+from functools import lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+from history import UNPACKED, MoveHistory, MoveMeta, _identity, pack_move
+from services.telemetry import LOGGER_NAME
+
+_log = logging.getLogger(LOGGER_NAME)
+
+if TYPE_CHECKING:  # tkinter/ReplayPanel are imported only when the window opens
+    from gui.replay import ReplayPanel
+
+try:  # python-chess is optional: other board objects take the generic paths
+    import chess as _chess  # type: ignore
+    _move_from_uci = _chess.Move.from_uci
+    # piece type -> MoveMeta promotion letter
+    _PROMO_BY_TYPE = {pt: _chess.piece_symbol(pt).upper() for pt in _chess.PIECE_TYPES}
+except ImportError:
+    _chess = None
+    _move_from_uci = None
+    _PROMO_BY_TYPE = {}
+
+# canonical square names (index = square number); every MoveMeta shares these objects
+_SQUARE_NAMES = tuple(f + r for r in "12345678" for f in "abcdefgh")
+_SQ_INTERN = {name: name for name in _SQUARE_NAMES}
+
+# promotion letter in either case -> UCI suffix / MoveMeta form (no per-move lower()/upper())
+_PROMO_UCI = {c: c.lower() for c in "QRBNqrbn"}
+_PROMO_META = {c: c.upper() for c in "QRBNqrbn"}
+
+# python-chess promotion piece type -> its bits in a pack_move() code (a1 is square 0)
+_PROMO_BITS = {pt: pack_move("a1", "a1", p) for pt, p in _PROMO_BY_TYPE.items()
+               if pack_move("a1", "a1", p) != UNPACKED}
+
+@lru_cache(maxsize=4096)
+def _parse_uci(uci: str):
+    # raises (TypeError) without python-chess; callers already treat that as "no hint"
+    return _move_from_uci(uci)
 
 # ----------------------------
 #  Resolve Board & Game
 # ----------------------------
+# dotted lookup -> C-level getter; tried in this order
+_BOARD_GETTERS = {path: attrgetter(path) for path in ("game.board", "board", "state.board", "ctx.board")}
+
 def _resolve_board_and_game(app: Any) -> Tuple[Any, Optional[Any]]:
     """
     Priority: game.board → board → state.board/ctx.board
+
+    The winning path is cached on the app (`_board_path`); it is only
+    re-probed once it stops working (AttributeError), e.g. after app.game
+    was set to None.
     """
-    game = getattr(app, "game", None)
-    if game is not None and hasattr(game, "board"):
-        return game.board, game
-    if hasattr(app, "board"):
-        return getattr(app, "board"), game
-    for attr0 in ("state", "ctx"):
-        if hasattr(app, attr0):
-            obj0 = getattr(app, attr0)
-            if hasattr(obj0, "board"):
-                return getattr(obj0, "board"), game
+    path = getattr(app, "_board_path", None)
+    if path is not None:
+        try:
+            return _BOARD_GETTERS[path](app), getattr(app, "game", None)
+        except AttributeError:
+            pass
+    for path, get_board in _BOARD_GETTERS.items():
+        try:
+            board = get_board(app)
+        except AttributeError:
+            continue
+        setattr(app, "_board_path", path)
+        return board, getattr(app, "game", None)
     raise RuntimeError("Board object not found.")
 
 # ----------------------------
 #  Adapters (snapshot / restore / reapply)
 # ----------------------------
+def _pop_if_last(b: Any, m: MoveMeta) -> bool:
+    # only pop when the board's last move is the recorded one (a takeback or a
+    # snapshot restore can leave the stack out of step with the history)
+    if not b.move_stack:
+        return False
+    last = b.peek()
+    names = _SQUARE_NAMES
+    if names[last.from_square] != m.from_sq or names[last.to_square] != m.to_sq:
+        return False
+    b.pop()
+    return True
+
+def _push_recorded(b: Any, m: MoveMeta) -> None:
+    # replay on python-chess: the recorded squares are exact (read back from the
+    # board), so push the parsed move directly; push_san would re-run SAN parsing
+    # and go through the recording wrapper
+    b.push(_parse_uci(f"{m.from_sq}{m.to_sq}{_PROMO_UCI.get(m.promotion, '')}"))
+
+@lru_cache(maxsize=4096)
+def _move_for_code(code: int):
+    # pack_move() code -> chess.Move; promotion index 1..4 is N..Q, i.e. piece type - 1
+    promo = (code >> 12) & 7
+    return _chess.Move(code & 63, (code >> 6) & 63, promo + 1 if promo else None)
+
+def _push_code(b: Any, code: int) -> None:
+    b.push(_move_for_code(code))
+
+def _move_stack_depth(b: Any) -> int:
+    return len(b.move_stack)
+
+def _assign_board_inplace(b: Any, st: Any) -> None:
+    # keep the board object: GameState/BoardView hold references to it.
+    # The snapshot keeps its stack, so put back its root and replay that stack:
+    # takeback and PGN export (board.root()) then see the whole game
+    root = st.root()
+    b.pawns, b.knights, b.bishops = root.pawns, root.knights, root.bishops
+    b.rooks, b.queens, b.kings = root.rooks, root.queens, root.kings
+    b.occupied_co = list(root.occupied_co)
+    b.occupied, b.promoted = root.occupied, root.promoted
+    b.turn, b.castling_rights, b.ep_square = root.turn, root.castling_rights, root.ep_square
+    b.halfmove_clock, b.fullmove_number = root.halfmove_clock, root.fullmove_number
+    b.chess960 = root.chess960
+    b.clear_stack()
+    for mv in st.move_stack:
+        b.push(mv)
+
+_CONTAINERS = (list, dict, set, bytearray)
+
+def _structural_copy(v: Any) -> Any:
+    """Copy nested built-in containers; leaves (str/int/tuple/...) are shared.
+
+    Board states are piece codes and counters, so this is all deepcopy did
+    for them, minus its memo table and per-object dispatch.
+    """
+    if isinstance(v, list):
+        return [_structural_copy(x) if isinstance(x, _CONTAINERS) else x for x in v]
+    if isinstance(v, dict):
+        return {k: _structural_copy(x) if isinstance(x, _CONTAINERS) else x for k, x in v.items()}
+    if isinstance(v, (set, bytearray)):
+        return v.copy()
+    return v
+
+def _shares_containers(a: Any, b: Any) -> bool:
+    # True if any container in `a` is the very same object at the same place in `b`
+    if not isinstance(a, _CONTAINERS):
+        return False
+    if a is b:
+        return True
+    if isinstance(a, list) and isinstance(b, list):
+        return any(_shares_containers(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return any(_shares_containers(x, b[k]) for k, x in a.items() if k in b)
+    return False
+
+def _fresh_to_dict(board: Any) -> bool:
+    """Whether to_dict() hands out new containers on every call (probed once).
+
+    If it does, a snapshot can keep the returned dict as-is; otherwise
+    (e.g. it returns live lists off the board) each snapshot is copied.
+    Either way from_dict() gets a copy, as it may adopt and later mutate it.
+    """
+    try:
+        return not _shares_containers(board.to_dict(), board.to_dict())
+    except Exception:
+        return False
+
+# __dict__ boards: snapshot instance data as one pickle (a C-level walk, and the
+# bytes are immutable, so no copier); off, or if the data won't pickle, copy
+# container attributes instead
+_PICKLE_DICT_SNAPSHOTS = True
+_PICKLE_PROTOCOL = 5
+_WRAP_TAG = "__replay_wrapped__"
+
+def _data_attrs(b: Any) -> dict:
+    # instance data only: commit wrappers and the wrap tag installed here are skipped
+    return {k: v for k, v in b.__dict__.items() if k != _WRAP_TAG and not callable(v)}
+
+def _picklable_state(board: Any) -> bool:
+    try:
+        pickle.loads(pickle.dumps(_data_attrs(board), _PICKLE_PROTOCOL))
+        return True
+    except Exception:
+        return False
+
+# Stride of full checkpoints for generic boards. python-chess boards take none:
+# they walk their own move stack (see MoveHistory's stack_depth)
+_DEFAULT_SNAPSHOT_STRIDE = 8
+
+def _packed_replay(board: Any) -> Optional[Callable[[Any, int], None]]:
+    # python-chess replays pack_move() codes directly; other boards go through MoveMeta
+    return _push_code if _chess is not None and isinstance(board, _chess.Board) else None
+
+def _stack_depth_for(board: Any) -> Optional[Callable[[Any], int]]:
+    return _move_stack_depth if _chess is not None and isinstance(board, _chess.Board) else None
+
 def _make_adapters(board: Any) -> Tuple[
     Callable[[Any], Any], Callable[[Any, Any], None], Callable[[Any, MoveMeta], None],
+    Optional[Callable[[Any], Any]], Optional[Callable[[Any, MoveMeta], bool]],
 ]:
-    # Prefer python-chess FEN
-    if hasattr(board, "fen") and callable(getattr(board, "fen")) and hasattr(board, "set_fen"):
-        def get_state(b): return {"fen": b.fen()}
-        def set_state(b, st): b.set_fen(st["fen"])
+    # python-chess: a Board copy (with its stack), restored in place (no FEN print/parse).
+    # Otherwise FEN; a FEN string is immutable, so snapshots need no copy
+    copier: Optional[Callable[[Any], Any]] = None
+    undo_move: Optional[Callable[[Any, MoveMeta], bool]] = None
+    apply_move: Optional[Callable[[Any, MoveMeta], None]] = None
+    if _chess is not None and isinstance(board, _chess.Board):
+        def get_state(b): return b.copy()
+        set_state = _assign_board_inplace
+        apply_move = _push_recorded
+        undo_move = _pop_if_last
+    elif hasattr(board, "fen") and callable(getattr(board, "fen")) and hasattr(board, "set_fen"):
+        def get_state(b): return b.fen()
+        def set_state(b, st): b.set_fen(st)
     elif hasattr(board, "to_fen") and hasattr(board, "from_fen"):
-        def get_state(b): return {"fen": b.to_fen()}
-        def set_state(b, st): b.from_fen(st["fen"])
+        def get_state(b): return b.to_fen()
+        def set_state(b, st): b.from_fen(st)
     elif hasattr(board, "to_dict") and hasattr(board, "from_dict"):
-        def get_state(b): return copy.deepcopy(b.to_dict())
-        def set_state(b, st): b.from_dict(copy.deepcopy(st))
+        def get_state(b): return b.to_dict()
+        if _fresh_to_dict(board):
+            # snapshots are private already: copy only on the way back in
+            def set_state(b, st): b.from_dict(_structural_copy(st))
+        else:
+            def set_state(b, st): b.from_dict(st)
+            copier = _structural_copy
+    elif _PICKLE_DICT_SNAPSHOTS and _picklable_state(board):
+        dumps, loads, proto = pickle.dumps, pickle.loads, _PICKLE_PROTOCOL
+        def get_state(b): return dumps(_data_attrs(b), proto)
+        def set_state(b, st): b.__dict__.update(loads(st))
     else:
-        def get_state(b): return copy.deepcopy(b.__dict__)
-        def set_state(b, st): b.__dict__.update(copy.deepcopy(st))
-
-    def apply_move(b, m: MoveMeta):
+        def get_state(b): return b.__dict__
+        def set_state(b, st): b.__dict__.update(st)
+        # only attributes holding containers need copying; found once, here
+        mutable = tuple(k for k, v in board.__dict__.items() if isinstance(v, _CONTAINERS))
+        def copier(st):
+            st = dict(st)
+            for k in mutable:
+                if k in st:
+                    st[k] = _structural_copy(st[k])
+            return st
+
+    def _apply_generic(b, m: MoveMeta):
         # 1) SAN 우선: python-chess는 push_san 사용
         if m.san and hasattr(b, "push_san"):
             b.push_san(m.san); return
         # 2) UCI 경로: from/to 존재하면 push
         if hasattr(b, "push") and m.from_sq and m.to_sq:
             try:
-                import chess  # type: ignore
-                uci = m.from_sq + m.to_sq + (m.promotion.lower() if m.promotion else "")
-                mv = chess.Move.from_uci(uci)
+                uci = f"{m.from_sq}{m.to_sq}{_PROMO_UCI.get(m.promotion, '')}"
+                mv = _parse_uci(uci)
                 b.push(mv); return
             except Exception:
                 pass
@@ -66,19 +251,33 @@ def _make_adapters(board: Any) -> Tuple[
                 fn(m.from_sq, m.to_sq, promotion=m.promotion); return
         raise RuntimeError("apply_move: no suitable method on board for replay")
 
-    return get_state, set_state, apply_move
+    return get_state, set_state, apply_move or _apply_generic, copier, undo_move
 
 # ----------------------------
 #  Helpers: redraw/AI/busy
 # ----------------------------
+def _coalesce_idle(app: Any, fn: Callable[[], None]) -> Callable[[], None]:
+    # at most one call per Tk idle cycle, however many history changes queue up
+    pending = [False]
+    def _run():
+        pending[0] = False
+        fn()
+    def _request():
+        if not pending[0]:
+            pending[0] = True
+            app.after_idle(_run)
+    return _request
+
 def _find_redraw(app: Any) -> Callable[[], None]:
-    # Prefer BoardView.redraw()
+    # Prefer BoardView.schedule_redraw() (already idle-coalesced), then BoardView.redraw()
     bv = getattr(app, "board_view", None)
+    if bv is not None and callable(getattr(bv, "schedule_redraw", None)):
+        return bv.schedule_redraw
     if bv is not None and hasattr(bv, "redraw") and callable(bv.redraw):
-        return bv.redraw
+        return _coalesce_idle(app, bv.redraw)
     for n in ("redraw_board", "draw_board", "render_board", "refresh", "redraw", "update_board", "repaint"):
         fn = getattr(app, n, None)
-        if callable(fn): return fn
+        if callable(fn): return _coalesce_idle(app, fn)
     return lambda: None
 
 def _find_ai_tick(app: Any, game: Optional[Any]) -> Callable[[], None]:
@@ -95,7 +294,8 @@ def _make_busy(app: Any) -> Callable[[bool], None]:
     def busy(on: bool) -> None:
         try:
             app.config(cursor="watch" if on else "")
-            app.update_idletasks(); app.update()
+            # repaint the cursor only; a full update() would run queued input re-entrantly
+            app.update_idletasks()
         except Exception:
             pass
     return busy
@@ -104,7 +304,7 @@ def _make_busy(app: Any) -> Callable[[bool], None]:
 #  Sentinel to avoid double-wrapping
 # ----------------------------
 def _mark_wrapped(owner: Any, name: str) -> bool:
-    tag = "__replay_wrapped__"
+    tag = _WRAP_TAG
     s = getattr(owner, tag, None)
     if s is None:
         s = set(); setattr(owner, tag, s)
@@ -112,6 +312,154 @@ def _mark_wrapped(owner: Any, name: str) -> bool:
         return True
     s.add(name); return False
 
+# ----------------------------
+#  Move metadata read back from the board
+# ----------------------------
+def _is_chess_board(obj: Any) -> bool:
+    return _chess is not None and isinstance(obj, _chess.Board)
+
+def _last_move_packed(base: Any) -> Tuple[int, str]:
+    """(pack_move() code, SAN) for the move just committed on a python-chess board.
+
+    SAN needs the position before the move, so the move is popped and
+    re-pushed with san_and_push() (the same push+check work san() does).
+    Square numbers are already the code's 6-bit fields.
+    """
+    mv = base.pop()
+    san = base.san_and_push(mv)
+    return mv.from_square | (mv.to_square << 6) | _PROMO_BITS.get(mv.promotion, 0), san
+
+def _record(history: MoveHistory, owner: Any, san: Optional[str], from_sq: Optional[str],
+            to_sq: Optional[str], promo: Optional[str], last_san: Optional[Callable[[], str]]) -> None:
+    # generic boards: whatever the wrapper could learn from the call
+    if san is None and last_san is not None:
+        try: san = last_san()
+        except Exception: san = None  # the board's own helper; no SAN is fine
+    code = pack_move(from_sq, to_sq, promo)
+    try:
+        if code != UNPACKED:  # plain squares: no MoveMeta needed
+            history.push_packed(owner, code, san or "?")
+        else:
+            history.push(owner, MoveMeta(san=san or "?", from_sq=from_sq or "?",
+                                         to_sq=to_sq or "?", promotion=promo))
+    except Exception:
+        # the move is already on the board: don't fail the commit, but don't hide it
+        _log.exception("replay: could not record move %s", san or f"{from_sq}{to_sq}")
+
+def _san_hint(base_san: Optional[Callable[[Any], str]], uci: str) -> Optional[str]:
+    # pre-commit SAN from the board's san(); needs python-chess to parse the UCI
+    if base_san is None or _move_from_uci is None:
+        return None
+    try:
+        return base_san(_parse_uci(uci))
+    except Exception:
+        return None  # foreign san() rejecting the move only costs the hint
+
+# ----------------------------
+#  Commit wrappers: one small slotted object per wrapped method
+#  (everything a call needs is bound at wrap time, not looked up per commit)
+# ----------------------------
+class _ChessCommit:
+    """python-chess: no pre-call SAN hint; the committed move is read back afterwards."""
+    __slots__ = ("fn", "base", "owner", "push_packed")
+
+    def __init__(self, fn, base, owner, history):
+        self.fn, self.base, self.owner = fn, base, owner
+        self.push_packed = history.push_packed
+
+    def __call__(self, *args, **kwargs):
+        ret = self.fn(*args, **kwargs)  # 실제 커밋
+        base = self.base
+        # 불법/실패면 기록하지 않음
+        if ret is not False and base.move_stack:
+            code, san = _last_move_packed(base)
+            try:
+                self.push_packed(self.owner, code, san)
+            except Exception:
+                # the move is already on the board: don't fail the commit, but don't hide it
+                _log.exception("replay: could not record move %s", san)
+        return ret
+
+class _SanCommit:
+    """SAN-taking methods: the SAN is the argument itself."""
+    __slots__ = ("fn", "owner", "history", "last_san")
+
+    def __init__(self, fn, owner, history, last_san):
+        self.fn, self.owner, self.history, self.last_san = fn, owner, history, last_san
+
+    def __call__(self, *args, **kwargs):
+        ret = self.fn(*args, **kwargs)  # 실제 커밋
+        if ret is not False:  # 불법/실패면 기록하지 않음
+            san = args[0] if args else None
+            if san is not None and type(san) is not str:
+                san = str(san)
+            _record(self.history, self.owner, san, None, None, None, self.last_san)
+        return ret
+
+class _AlgCommit:
+    """(from_sq, to_sq, promotion) methods: SAN hint computed before the commit."""
+    __slots__ = ("fn", "owner", "history", "base_san", "last_san")
+
+    def __init__(self, fn, owner, history, base_san, last_san):
+        self.fn, self.owner, self.history = fn, owner, history
+        self.base_san, self.last_san = base_san, last_san
+
+    def __call__(self, *args, **kwargs):
+        # Pre-calc meta
+        san_hint = None
+        from_sq = kwargs.get("from_sq")
+        to_sq = kwargs.get("to_sq")
+        promo = kwargs.get("promotion")
+        if len(args) >= 2:
+            from_sq, to_sq = args[0], args[1]
+            if type(from_sq) is not str: from_sq = str(from_sq)
+            if type(to_sq) is not str: to_sq = str(to_sq)
+            from_sq = _SQ_INTERN.get(from_sq, from_sq)
+            to_sq = _SQ_INTERN.get(to_sq, to_sq)
+        if self.base_san is not None and from_sq and to_sq:
+            san_hint = _san_hint(self.base_san, f"{from_sq}{to_sq}{_PROMO_UCI.get(promo, '')}")
+
+        ret = self.fn(*args, **kwargs)  # 실제 커밋
+        if ret is not False:  # 불법/실패(ret is False)면 기록하지 않음
+            _record(self.history, self.owner, san_hint, from_sq, to_sq, promo, self.last_san)
+        return ret
+
+class _UciCommit:
+    """Game-side UCI methods (apply_uci, ...) on generic boards."""
+    __slots__ = ("fn", "owner", "history", "base_san", "last_san")
+
+    def __init__(self, fn, owner, history, base_san, last_san):
+        self.fn, self.owner, self.history = fn, owner, history
+        self.base_san, self.last_san = base_san, last_san
+
+    def __call__(self, *args, **kwargs):
+        san_hint = None
+        from_sq = kwargs.get("from_sq")
+        to_sq = kwargs.get("to_sq")
+        promo = kwargs.get("promotion")
+        uci = args[0] if args else kwargs.get("uci")
+        if uci is not None and type(uci) is not str:
+            uci = str(uci)
+        if uci and len(uci) >= 4:
+            from_sq, to_sq = uci[:2], uci[2:4]
+            from_sq = _SQ_INTERN.get(from_sq, from_sq)
+            to_sq = _SQ_INTERN.get(to_sq, to_sq)
+            if len(uci) >= 5: promo = _PROMO_META.get(uci[4], uci[4])
+            san_hint = _san_hint(self.base_san, uci)
+
+        ret = self.fn(*args, **kwargs)  # 실제 커밋
+        if ret is not False:  # 불법/실패면 기록하지 않음
+            _record(self.history, self.owner, san_hint, from_sq, to_sq, promo, self.last_san)
+        return ret
+
+_COMMIT_TYPES = (_ChessCommit, _SanCommit, _AlgCommit, _UciCommit)
+
+def _original_method(owner: Any, name: str) -> Optional[Callable[..., Any]]:
+    # a wrapper left by an earlier pass is unwrapped and replaced, so a rebind
+    # points it at the current board instead of the one it was first built for
+    fn = getattr(owner, name, None)
+    return fn.fn if isinstance(fn, _COMMIT_TYPES) else fn
+
 # ----------------------------
 #  Record only committed moves (Board side)
 # ----------------------------
@@ -125,122 +473,59 @@ def _wrap_commit_methods_on_board(board: Any, history: MoveHistory) -> None:
         ("push_san", "san"),
         # ("push", "push"),  # excluded: engine search noise
     )
+    # resolved once per wrap pass, not per commit
+    base = getattr(board, "board", None) or board
+    chess_base = _is_chess_board(base)
+    base_san = getattr(base, "san", None)
+    last_san = getattr(board, "last_san", None)
     for name, kind in candidates:
-        if not hasattr(board, name): continue
-        if _mark_wrapped(board, name): continue
-        original = getattr(board, name)
-
-        def _mk_wrapper(fn, mode: str):
-            def _wrapped(*args, **kwargs):
-                # Pre-calc meta (best effort)
-                san_hint = None
-                from_sq = kwargs.get("from_sq")
-                to_sq = kwargs.get("to_sq")
-                promo = kwargs.get("promotion")
-                try:
-                    if mode == "san":
-                        if args: san_hint = str(args[0])
-                    else:
-                        if len(args) >= 2:
-                            from_sq, to_sq = str(args[0]), str(args[1])
-                        promo = kwargs.get("promotion")
-                        try:
-                            import chess  # type: ignore
-                            base = getattr(board, "board", None) or board
-                            if hasattr(base, "san") and from_sq and to_sq:
-                                uci = from_sq + to_sq + (promo.lower() if promo else "")
-                                mv = chess.Move.from_uci(uci)
-                                san_hint = base.san(mv)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-                ret = fn(*args, **kwargs)  # 실제 커밋
-
-                # 불법/실패(ret is False)면 기록하지 않음
-                if ret is False:
-                    return ret
-
-                try:
-                    san = san_hint
-                    if san is None and hasattr(board, "last_san"):
-                        try: san = board.last_san()
-                        except Exception: san = None
-                    history.push(
-                        board,
-                        MoveMeta(
-                            san=san or "?",
-                            from_sq=from_sq or "?",
-                            to_sq=to_sq or "?",
-                            promotion=promo,
-                        ),
-                    )
-                except Exception:
-                    pass
-                return ret
-            return _wrapped
-
-        setattr(board, name, _mk_wrapper(original, kind))
+        original = _original_method(board, name)
+        if original is None: continue
+        if chess_base:
+            wrapper = _ChessCommit(original, base, board, history)
+        elif kind == "san":
+            wrapper = _SanCommit(original, board, history, last_san)
+        else:
+            wrapper = _AlgCommit(original, board, history, base_san, last_san)
+        setattr(board, name, wrapper)
 
 # ----------------------------
 #  Record committed moves (Game side: apply_uci, etc.)
 # ----------------------------
 def _wrap_commit_methods_on_game(game: Any, board_for_push: Any, history: MoveHistory) -> None:
     candidates = ("apply_uci", "commit_move", "apply_move_uci", "play_move")
+    # resolved once per wrap pass, not per commit
+    base = getattr(board_for_push, "board", None) or board_for_push
+    chess_base = _is_chess_board(base)
+    base_san = getattr(base, "san", None)
+    last_san = getattr(board_for_push, "last_san", None)
     for name in candidates:
-        if not hasattr(game, name): continue
-        if _mark_wrapped(game, name): continue
-        original = getattr(game, name)
+        original = _original_method(game, name)
+        if original is None: continue
+        if chess_base:
+            wrapper = _ChessCommit(original, base, board_for_push, history)
+        else:
+            wrapper = _UciCommit(original, board_for_push, history, base_san, last_san)
+        setattr(game, name, wrapper)
 
+# ----------------------------
+#  Rebind hooks (methods that replace the board/game)
+# ----------------------------
+# public names only; ChessApp binds its menu to private methods and calls on_board_replaced()
+_APP_REPLACERS = ("new_game", "reset_game", "start_new_game", "load_fen", "load_pgn", "open_pgn")
+_GAME_REPLACERS = ("load_fen", "load_pgn", "reset")
+
+def _hook_rebind(owner: Any, names: Tuple[str, ...], rebind: Callable[[], None]) -> None:
+    for name in names:
+        orig = getattr(owner, name, None)
+        if not callable(orig) or _mark_wrapped(owner, f"hook:{name}"): continue
         def _mk_wrapper(fn):
-            def _wrapped(*args, **kwargs):
-                san_hint = None
-                from_sq = kwargs.get("from_sq")
-                to_sq = kwargs.get("to_sq")
-                promo = kwargs.get("promotion")
-                try:
-                    uci = str(args[0]) if args else kwargs.get("uci")
-                    if uci and len(uci) >= 4:
-                        from_sq, to_sq = uci[:2], uci[2:4]
-                        if len(uci) >= 5: promo = uci[4].upper()
-                        try:
-                            import chess  # type: ignore
-                            base = getattr(board_for_push, "board", None) or board_for_push
-                            if hasattr(base, "san"):
-                                mv = chess.Move.from_uci(uci)
-                                san_hint = base.san(mv)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-
-                ret = fn(*args, **kwargs)  # 실제 커밋
-
-                # 불법/실패면 기록하지 않음
-                if ret is False:
-                    return ret
-
-                try:
-                    san = san_hint
-                    if san is None and hasattr(board_for_push, "last_san"):
-                        try: san = board_for_push.last_san()
-                        except Exception: san = None
-                    history.push(
-                        board_for_push,
-                        MoveMeta(
-                            san=san or "?",
-                            from_sq=from_sq or "?",
-                            to_sq=to_sq or "?",
-                            promotion=promo,
-                        ),
-                    )
-                except Exception:
-                    pass
-                return ret
-            return _wrapped
-
-        setattr(game, name, _mk_wrapper(original))
+            def _w(*a, **kw):
+                r = fn(*a, **kw)
+                try: rebind()
+                finally: return r
+            return _w
+        setattr(owner, name, _mk_wrapper(orig))
 
 # ----------------------------
 #  Public API
@@ -248,23 +533,33 @@ def _wrap_commit_methods_on_game(game: Any, board_for_push: Any, history: MoveHi
 def attach_replay(
     app: Any,
     *,
-    snapshot_stride: int = 8,
+    snapshot_stride: Optional[int] = None,
     open_window: bool = True,
     window_geometry: str = "360x520+80+80",
 ) -> MoveHistory:
     """
     - Record only committed moves (skip illegal)
-    - Use python-chess FEN snapshots
-    - Auto-rebind when board/game objects are replaced
+    - Use python-chess board/FEN snapshots; python-chess boards jump by walking
+      their own move stack, which stays whole (takeback, PGN export)
+    - Rebind when board/game objects are replaced (hooked methods, or the
+      app calls app.on_board_replaced())
     - ReplayPanel shows busy cursor and triggers AI turn on jump
+    - Idempotent per app: a second call returns the existing history
     """
+    existing = getattr(app, "_move_history", None)
+    if isinstance(existing, MoveHistory):
+        return existing  # wrappers are already installed; don't stack a second set
     board, game = _resolve_board_and_game(app)
     redraw = _find_redraw(app)
     ai_tick = _find_ai_tick(app, game)
     busy = _make_busy(app)
 
-    get_state, set_state, apply_move = _make_adapters(board)
-    history = MoveHistory(get_state, set_state, apply_move, snapshot_stride=snapshot_stride)
+    get_state, set_state, apply_move, copier, undo_move = _make_adapters(board)
+    history = MoveHistory(get_state, set_state, apply_move,
+                          snapshot_stride=snapshot_stride or _DEFAULT_SNAPSHOT_STRIDE,
+                          snapshot_copier=copier, undo_move=undo_move,
+                          storage="packed", apply_packed=_packed_replay(board),
+                          stack_depth=_stack_depth_for(board))
     history.reset(board)
 
     _wrap_commit_methods_on_board(board, history)
@@ -274,6 +569,8 @@ def attach_replay(
     # UI
     panel: Optional[ReplayPanel] = None
     if open_window:
+        import tkinter as tk
+        from gui.replay import ReplayPanel
         top = tk.Toplevel(app)
         top.title("Move History")
         try: top.geometry(window_geometry)
@@ -284,47 +581,42 @@ def attach_replay(
 
     setattr(app, "_move_history", history)
 
-    # Auto rebind (board/game replacement)
+    # Rebind on board/game replacement: event-driven, no polling. Known
+    # replacing methods are hooked; anything else calls app.on_board_replaced().
     last_ids = {"board": id(board), "game": id(game) if game is not None else None}
     def _rebinding():
         try:
             cur_board, cur_game = _resolve_board_and_game(app)
         except Exception:
-            app.after(200, _rebinding); return
+            return
 
         changed = (id(cur_board) != last_ids["board"]) or ((id(cur_game) if cur_game else None) != last_ids["game"])
         if changed:
             last_ids["board"] = id(cur_board)
             last_ids["game"] = id(cur_game) if cur_game else None
 
-            gs, ss, am = _make_adapters(cur_board)
+            gs, ss, am, cp, um = _make_adapters(cur_board)
             history.get_state = gs
             history.set_state = ss
             history.apply_move = am
+            history.copy_state = cp or _identity
+            history.undo_move = um
+            history.apply_packed = _packed_replay(cur_board)
+            history.stack_depth = _stack_depth_for(cur_board)
+            history.snapshot_stride = snapshot_stride or _DEFAULT_SNAPSHOT_STRIDE
             history.reset(cur_board)
 
             _wrap_commit_methods_on_board(cur_board, history)
             if cur_game is not None:
                 _wrap_commit_methods_on_game(cur_game, board_for_push=cur_board, history=history)
+                _hook_rebind(cur_game, _GAME_REPLACERS, _rebinding)
             if panel is not None and hasattr(panel, "rebind"):
                 try: panel.rebind(cur_board)
                 except Exception: pass
 
-        app.after(150, _rebinding)
-
-    app.after(150, _rebinding)
-
-    # Proactive trigger after new/reset/load if present
-    for name in ("new_game", "reset_game", "start_new_game", "load_fen", "load_pgn", "open_pgn"):
-        if hasattr(app, name) and callable(getattr(app, name)):
-            orig = getattr(app, name)
-            if _mark_wrapped(app, f"hook:{name}"): continue
-            def _mk_wrapper(fn):
-                def _w(*a, **kw):
-                    r = fn(*a, **kw)
-                    try: _rebinding()
-                    finally: return r
-                return _w
-            setattr(app, name, _mk_wrapper(orig))
+    _hook_rebind(app, _APP_REPLACERS, _rebinding)
+    if game is not None:
+        _hook_rebind(game, _GAME_REPLACERS, _rebinding)
+    setattr(app, "on_board_replaced", _rebinding)
 
     return history
@@ -1,15 +1,43 @@
 from __future__ import annotations
+import random
 import time
-from typing import Callable, TypeVar, Tuple
+from typing import Callable, Optional, Tuple, Type, TypeVar
 
 T = TypeVar("T")
 
-def retry(fn: Callable[[], T], *, attempts: int = 3, backoff: float = 0.5) -> Tuple[bool, T | None, Exception | None]:
+def retry(
+    fn: Callable[[], T],
+    *,
+    attempts: int = 3,
+    backoff: float = 0.5,
+    max_delay: float = 5.0,
+    deadline: Optional[float] = None,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    jitter: float = 0.1,
+) -> Tuple[bool, T | None, Exception | None]:
+    """Call fn() until it succeeds; returns (ok, result, last_exception).
+
+    Only `exceptions` are retried, with capped exponential backoff plus
+    random jitter; any other Exception is returned at once. `deadline` is
+    the maximum total seconds across all attempts, sleeps included; a sleep
+    that would overrun it ends the retries early.
+    KeyboardInterrupt, SystemExit and MemoryError always propagate.
+    """
+    t0 = time.monotonic()
     last_exc = None
     for i in range(attempts):
         try:
             return True, fn(), None
-        except Exception as e:
+        except (KeyboardInterrupt, SystemExit, MemoryError):
+            raise
+        except exceptions as e:
             last_exc = e
-            time.sleep(backoff * (2 ** i))
+        except Exception as e:
+            return False, None, e  # not retryable: don't sleep on a bug
+        if i == attempts - 1:
+            break  # no point sleeping after the last attempt
+        delay = min(max_delay, backoff * (2 ** i)) + random.uniform(0, jitter)
+        if deadline is not None and time.monotonic() + delay > t0 + deadline:
+            break
+        time.sleep(delay)
     return False, None, last_exc
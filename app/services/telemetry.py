@@ -1,15 +1,57 @@
 from __future__ import annotations
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-def setup_logging(project_root: Path) -> logging.Logger:
+LOGGER_NAME = "chess_proto"
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUPS = 3
+LOG_LEVEL_ENV = "CHESS_LOG_LEVEL"  # e.g. DEBUG, WARNING or a number; default INFO
+
+def _env_level() -> int:
+    raw = os.environ.get(LOG_LEVEL_ENV, "").strip()
+    if raw.isdigit():
+        return int(raw)
+    level = logging.getLevelName(raw.upper()) if raw else logging.INFO
+    return level if isinstance(level, int) else logging.INFO
+
+class GatedLogger(logging.LoggerAdapter):
+    """Drops disabled records before LoggerAdapter.process() builds kwargs.
+
+    Use %-style args (log.info("moved %s", uci)) so nothing is formatted
+    unless the level is enabled.
+    """
+    def debug(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(msg, *args, **kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(msg, *args, **kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(msg, *args, **kwargs)
+
+def setup_logging(project_root: Path) -> GatedLogger:
     logs_dir = project_root / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
-    logger = logging.getLogger("chess_proto")
-    logger.setLevel(logging.INFO)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(_env_level())
+    logger.propagate = False  # the queue handler is the only sink; root would log it again
     if not logger.handlers:
-        fh = logging.FileHandler(logs_dir / "app.log", encoding="utf-8")
+        fh = RotatingFileHandler(logs_dir / "app.log", maxBytes=LOG_MAX_BYTES,
+                                 backupCount=LOG_BACKUPS, encoding="utf-8")
         fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
         fh.setFormatter(fmt)
-        logger.addHandler(fh)
-    return logger
+        # callers (Tk thread included) only enqueue; file writes happen on the listener thread
+        q: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(q, fh, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(QueueHandler(q))
+        logger.queue_listener = listener  # stop() flushes the queue; also done at exit
+        atexit.register(listener.stop)
+    return GatedLogger(logger, {})
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+build_engine_ext.py — Compile the optional Cython core of SimpleAI in place.
+
+- Input:  app/engine/_simple_ai.pyx
+- Output: app/engine/_simple_ai.*.so (picked up automatically by SimpleAI)
+
+Usage:
+  python scripts/build_engine_ext.py
+
+Requires:
+  - pip install cython
+  - a C compiler
+Without the build, SimpleAI keeps using the pure-Python search.
+"""
+from __future__ import annotations
+from pathlib import Path
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+ENGINE_DIR = Path(__file__).resolve().parents[1] / "app" / "engine"
+
+if __name__ == "__main__":
+    ext = Extension("_simple_ai", [str(ENGINE_DIR / "_simple_ai.pyx")])
+    setup(
+        name="chess-proto-engine-ext",
+        ext_modules=cythonize([ext], compiler_directives={"language_level": 3}),
+        script_args=["build_ext", "--build-lib", str(ENGINE_DIR)],
+    )
+    print("[✓] Built SimpleAI extension into", ENGINE_DIR)
@@ -9,35 +9,143 @@ Usage:
   python scripts/prep_assets.py --src assets/svg/merida --out assets/png --sizes 72 96
   python scripts/prep_assets.py --src assets/svg/merida --out assets/png --sizes 72 --engine inkscape
 
-Requires:
+Requires (auto picks the first available):
+  - Fastest: resvg (pip install resvg-py, or the resvg CLI on PATH)
   - Prefer: pip install cairosvg
-  - Fallback: Inkscape CLI available (inkscape command)
+  - Fallback: Inkscape 1.x CLI (inkscape command; driven as one --shell session)
+  - Optional: pip install pillow (cairosvg renders each SVG once, at the largest size,
+    and the smaller sizes are resampled from it)
+
+Outputs newer than their SVG are left alone, so reruns only redo what changed.
 """
 from __future__ import annotations
 import argparse
+import os
 import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
+
+try:  # OSError: the package is there but libcairo isn't
+    import cairosvg  # type: ignore
+    _svg2png = cairosvg.svg2png
+    _HAS_CAIROSVG = True
+except (ImportError, OSError):
+    _svg2png = None
+    _HAS_CAIROSVG = False
+
+try:
+    import resvg_py  # type: ignore
+except ImportError:
+    resvg_py = None
+
+try:
+    from PIL import Image as _PILImage  # type: ignore
+except ImportError:
+    _PILImage = None
 
 PIECES = ["P","N","B","R","Q","K"]
 CODES = [f"{s}{p}" for s in ("w","b") for p in PIECES]
+ENGINES = ["resvg", "cairosvg", "inkscape"]  # auto preference order
 
-def _convert_one_cairosvg(src: Path, dst: Path, size: int):
-    import cairosvg  # type: ignore
+def _convert_one_cairosvg(svg: bytes, dst: Path, size: int):
     dst.parent.mkdir(parents=True, exist_ok=True)
-    cairosvg.svg2png(url=str(src), write_to=str(dst), output_width=size, output_height=size)
+    _svg2png(bytestring=svg, write_to=str(dst), output_width=size, output_height=size)
 
-def _convert_one_inkscape(src: Path, dst: Path, size: int):
+def _convert_cairosvg_job(job: Tuple[bytes, List[Tuple[Path, int]]]):
+    # process-pool entry point (must be picklable, so module level);
+    # one SVG's bytes (read once by the parent), all of its outputs, largest size first
+    svg, targets = job
+    if _PILImage is None or len(targets) == 1:
+        for dst, size in targets:
+            _convert_one_cairosvg(svg, dst, size)
+        return
+    (dst, size), rest = targets[0], targets[1:]
     dst.parent.mkdir(parents=True, exist_ok=True)
-    cmd = [
-        "inkscape",
-        str(src),
-        "-o", str(dst),
-        "-w", str(size),
-        "-h", str(size),
-    ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    png = _svg2png(bytestring=svg, output_width=size, output_height=size)
+    dst.write_bytes(png)
+    img = _PILImage.open(BytesIO(png))
+    img.load()
+    for dst, size in rest:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        img.resize((size, size), _PILImage.LANCZOS).save(dst)
+
+def _convert_one_resvg(src: Path, dst: Path, size: int):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if resvg_py is not None:
+        png = resvg_py.svg_to_bytes(svg_string=src.read_text(encoding="utf-8"), width=size, height=size)
+        dst.write_bytes(bytes(png))
+        return
+    proc = subprocess.run(["resvg", "-w", str(size), "-h", str(size), str(src), str(dst)],
+                          capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"resvg failed for {src}:\n{proc.stderr.strip()}")
+
+def _convert_resvg_job(job: Tuple[Path, Path, int]):
+    # process-pool entry point; one output file
+    _convert_one_resvg(*job)
+
+def _mtimes(d: Path) -> Dict[str, float]:
+    # file name -> mtime for one directory, in a single scan
+    try:
+        with os.scandir(d) as it:
+            return {e.name: e.stat().st_mtime for e in it if e.is_file()}
+    except FileNotFoundError:
+        return {}
+
+class _InkscapeShell:
+    """One `inkscape --shell` session for every export (Inkscape 1.x actions).
+
+    Starting Inkscape dominates a per-file run, so exports are streamed into a
+    single process; output files are checked once the session has quit.
+    """
+    def __init__(self):
+        self._err = tempfile.TemporaryFile()  # a full stderr pipe would stall the session
+        self._proc = subprocess.Popen(["inkscape", "--shell"], stdin=subprocess.PIPE,
+                                      stdout=subprocess.DEVNULL, stderr=self._err, text=True)
+        self._pending: List[Path] = []
+
+    def convert(self, src: Path, dst: Path, size: int):
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.unlink(missing_ok=True)  # existence after quit() is the success check
+        self._proc.stdin.write(f"file-open:{src}; export-filename:{dst}; "
+                               f"export-width:{size}; export-height:{size}; export-do; file-close\n")
+        self._pending.append(dst)
+
+    def close(self):
+        self._proc.communicate("quit\n")
+        missing = [str(p) for p in self._pending if not p.exists()]
+        self._err.seek(0)
+        err = self._err.read().decode(errors="replace").strip()
+        self._err.close()
+        if self._proc.returncode or missing:
+            raise RuntimeError("Inkscape export failed:\n" + "\n".join(missing) + (f"\n{err}" if err else ""))
+
+    def kill(self):
+        self._proc.kill()
+        self._proc.wait()
+        self._err.close()
+
+def _convert_inkscape_batch(src: Path, targets: List[Tuple[Path, int]]):
+    # one process per SVG, every size exported through the actions API (Inkscape 1.x)
+    actions = "".join(f"export-filename:{dst}; export-width:{size}; export-height:{size}; export-do; "
+                      for dst, size in targets)
+    for dst, _ in targets:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.unlink(missing_ok=True)
+    proc = subprocess.run(["inkscape", f"--actions={actions}", str(src)], capture_output=True, text=True)
+    missing = [str(dst) for dst, _ in targets if not dst.exists()]
+    if proc.returncode or missing:
+        raise RuntimeError("Inkscape export failed:\n" + "\n".join(missing) + "\n" + proc.stderr.strip())
+
+def _group_by_src(jobs: List[Tuple[Path, Path, int]]) -> Dict[Path, List[Tuple[Path, int]]]:
+    by_src: Dict[Path, List[Tuple[Path, int]]] = {}
+    for src, dst, size in jobs:
+        by_src.setdefault(src, []).append((dst, size))  # keeps the jobs' size order
+    return by_src
 
 def _validate_inputs(src_dir: Path, codes: List[str]):
     missing = [str(src_dir / f"{c}.svg") for c in codes if not (src_dir / f"{c}.svg").exists()]
@@ -46,13 +154,11 @@ def _validate_inputs(src_dir: Path, codes: List[str]):
 
 def _engine_available(name: str) -> bool:
     if name == "cairosvg":
-        try:
-            import cairosvg  # noqa
-            return True
-        except Exception:
-            return False
+        return _HAS_CAIROSVG
     if name == "inkscape":
         return shutil.which("inkscape") is not None
+    if name == "resvg":
+        return resvg_py is not None or shutil.which("resvg") is not None
     return False
 
 def convert_dir(src_svg_dir: Path, out_png_root: Path, sizes: Iterable[int], engine: str = "auto"):
@@ -63,31 +169,66 @@ def convert_dir(src_svg_dir: Path, out_png_root: Path, sizes: Iterable[int], eng
     # pick engine
     chosen = None
     if engine == "auto":
-        chosen = "cairosvg" if _engine_available("cairosvg") else ("inkscape" if _engine_available("inkscape") else None)
+        chosen = next((e for e in ENGINES if _engine_available(e)), None)
     else:
         chosen = engine if _engine_available(engine) else None
     if not chosen:
-        raise RuntimeError("No conversion engine available. Install 'cairosvg' or Inkscape CLI.")
-
-    for size in sizes:
-        out_dir = out_png_root / str(size)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        print(f"[i] Converting to {out_dir} using {chosen} ...")
-        for code in CODES:
-            src = src_svg_dir / f"{code}.svg"
-            dst = out_dir / f"{code}.png"
-            if chosen == "cairosvg":
-                _convert_one_cairosvg(src, dst, size)
-            else:
-                _convert_one_inkscape(src, dst, size)
-        print(f"[✓] Done: {size}px")
+        raise RuntimeError("No conversion engine available. Install 'resvg', 'cairosvg' or Inkscape CLI.")
+
+    sizes = sorted(set(sizes), reverse=True)
+    jobs = [(src_svg_dir / f"{code}.svg", out_png_root / str(size) / f"{code}.png", size)
+            for size in sizes for code in CODES]
+    total = len(jobs)
+    src_mtimes = _mtimes(src_svg_dir)
+    out_mtimes = {size: _mtimes(out_png_root / str(size)) for size in sizes}
+    pending = []
+    for job in jobs:
+        src, dst, size = job
+        if out_mtimes[size].get(dst.name, -1.0) >= src_mtimes[src.name]:
+            print(f"[skip] {dst}")
+        else:
+            pending.append(job)
+    jobs = pending
+    if not jobs:
+        print(f"[i] All {total} files in {out_png_root} are up to date.")
+        return
+    print(f"[i] Converting {len(jobs)} of {total} files into {out_png_root} using {chosen} ...")
+    if chosen == "inkscape":
+        shell = _InkscapeShell()  # one session for all sizes; forks are the cost there
+        try:
+            for job in jobs:
+                shell.convert(*job)
+        except BaseException:
+            shell.kill()
+            raise
+        try:
+            shell.close()
+        except RuntimeError:
+            # some builds misbehave in --shell mode; redo what's missing, one process per SVG
+            missing = [job for job in jobs if not job[1].exists()]
+            print(f"[!] Inkscape --shell left {len(missing)} files missing; retrying per SVG with --actions")
+            for src, targets in _group_by_src(missing).items():
+                _convert_inkscape_batch(src, targets)
+    elif chosen == "resvg":
+        # resvg renders fast at any size, so each output is its own job
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            for _ in pool.map(_convert_resvg_job, jobs):
+                pass
+    else:
+        # rasterization is CPU-bound and every SVG is independent
+        by_src = _group_by_src(jobs)  # sizes already descending
+        with ProcessPoolExecutor(max_workers=min(len(by_src), os.cpu_count() or 1)) as pool:
+            tasks = ((src.read_bytes(), targets) for src, targets in by_src.items())
+            for _ in pool.map(_convert_cairosvg_job, tasks):
+                pass
+    print(f"[✓] Done: {', '.join(str(s) for s in sorted(sizes))}px")
 
 def parse_args():
     ap = argparse.ArgumentParser(description="Convert chess SVG pieces to PNG at desired sizes.")
     ap.add_argument("--src", required=True, help="SVG dir (e.g., assets/svg/merida)")
     ap.add_argument("--out", default="assets/png", help="PNG root output dir (default: assets/png)")
     ap.add_argument("--sizes", nargs="+", type=int, default=[72], help="One or more square sizes in px (default: 72)")
-    ap.add_argument("--engine", choices=["auto","cairosvg","inkscape"], default="auto", help="Conversion engine")
+    ap.add_argument("--engine", choices=["auto", *ENGINES], default="auto", help="Conversion engine")
     return ap.parse_args()
 
 if __name__ == "__main__":
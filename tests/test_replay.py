@@ -0,0 +1,93 @@
+import sys
+import unittest
+from pathlib import Path
+
+APP = Path(__file__).resolve().parents[1] / "app"
+if str(APP) not in sys.path:
+    sys.path.insert(0, str(APP))
+
+from engine.rules import GameState  # noqa: E402
+from replay_bootstrap import attach_replay  # noqa: E402
+
+class _App:
+    pass
+
+def _attached(game: GameState):
+    app = _App()
+    app.game = game
+    return app, attach_replay(app, open_window=False)
+
+class ReplayRebindTest(unittest.TestCase):
+    def test_load_fen_then_move_records_the_new_board(self):
+        game = GameState()
+        app, history = _attached(game)
+        game.apply_uci("g1f3")
+        game.load_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+        start = game.board.fen()
+        self.assertTrue(game.apply_uci("e2e4"))
+        self.assertEqual([m.san for m in history.moves()], ["e4"])
+        self.assertEqual((history.moves()[0].from_sq, history.moves()[0].to_sq), ("e2", "e4"))
+        after = game.board.fen()
+        history.goto(game.board, 0)
+        self.assertEqual(game.board.fen(), start)
+        history.goto(game.board, 1)
+        self.assertEqual(game.board.fen(), after)
+
+    def test_on_board_replaced_rebinds_a_new_game(self):
+        app, history = _attached(GameState())
+        app.game.apply_uci("e2e4")
+        app.game = GameState()  # what ChessApp._new_game does
+        app.on_board_replaced()
+        self.assertEqual(history.total, 0)
+        self.assertTrue(app.game.apply_uci("d2d4"))
+        self.assertEqual([m.san for m in history.moves()], ["d4"])
+
+_RUY = ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5c6", "d7c6", "e1g1"]
+
+class ReplayStackTest(unittest.TestCase):
+    def setUp(self):
+        self.game = GameState()
+        self.app, self.history = _attached(self.game)
+        self.fens = [self.game.board.fen()]
+        for uci in _RUY:
+            self.assertTrue(self.game.apply_uci(uci))
+            self.fens.append(self.game.board.fen())
+
+    def test_jumps_keep_the_move_stack(self):
+        board = self.game.board
+        for target in (3, 9, 0, 5, 9, 2, 7):
+            self.history.goto(board, target)
+            self.assertEqual(board.fen(), self.fens[target])
+            self.assertEqual([m.uci() for m in board.move_stack], _RUY[:target])
+
+    def test_takeback_after_jump(self):
+        self.history.goto(self.game.board, 4)
+        self.game.undo(1)
+        self.assertEqual(self.game.board.fen(), self.fens[3])
+
+    def test_pgn_after_jump(self):
+        self.history.goto(self.game.board, 4)
+        self.assertIn("1. e4 e5 2. Nf3 Nc6 *", self.game.export_pgn())
+
+    def test_move_after_untracked_takeback_branches_there(self):
+        self.game.undo(3)  # not via the history
+        self.assertTrue(self.game.apply_uci("b5a4"))
+        self.assertEqual(self.history.total, 7)
+        self.assertEqual(self.history.moves()[-1].san, "Ba4")
+        self.history.goto(self.game.board, 4)
+        self.assertEqual(self.game.board.fen(), self.fens[4])
+        self.history.goto(self.game.board, 7)
+        self.assertEqual(self.game.board.peek().uci(), "b5a4")
+
+class PgnTest(unittest.TestCase):
+    def test_export_from_loaded_fen(self):
+        game = GameState()
+        fen = "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+        game.load_fen(fen)
+        game.apply_uci("e2e4")
+        pgn = game.export_pgn()
+        self.assertIn(f'[FEN "{fen}"]', pgn)
+        self.assertIn("1. e4 *", pgn)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+APP = Path(__file__).resolve().parents[1] / "app"
+if str(APP) not in sys.path:
+    sys.path.insert(0, str(APP))
+
+from services.retry import retry  # noqa: E402
+
+def _failing(*excs):
+    calls = []
+    def fn():
+        calls.append(None)
+        if len(calls) <= len(excs):
+            raise excs[len(calls) - 1]
+        return "ok"
+    return fn, calls
+
+class RetryScheduleTest(unittest.TestCase):
+    def setUp(self):
+        sleep = mock.patch("services.retry.time.sleep")
+        uniform = mock.patch("services.retry.random.uniform", return_value=0.05)
+        self.sleep = sleep.start()
+        self.uniform = uniform.start()
+        self.addCleanup(sleep.stop)
+        self.addCleanup(uniform.stop)
+
+    def slept(self):
+        return [c.args[0] for c in self.sleep.call_args_list]
+
+    def test_backoff_is_capped_and_jittered(self):
+        fn, calls = _failing(OSError(), OSError(), OSError())
+        ok, result, exc = retry(fn, attempts=4, backoff=0.5, max_delay=0.8, jitter=0.1)
+        self.assertEqual((ok, result, exc), (True, "ok", None))
+        self.assertEqual(len(calls), 4)
+        for got, want in zip(self.slept(), [0.55, 0.85, 0.85]):
+            self.assertAlmostEqual(got, want)
+        self.uniform.assert_called_with(0, 0.1)
+
+    def test_no_sleep_after_the_last_attempt(self):
+        err = OSError("down")
+        fn, calls = _failing(err, err, err)
+        ok, result, exc = retry(fn, attempts=3, backoff=0.5)
+        self.assertEqual((ok, result, exc), (False, None, err))
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(self.slept()), 2)
+
+    def test_only_listed_exceptions_are_retried(self):
+        err = ValueError("bug")
+        fn, calls = _failing(err)
+        ok, result, exc = retry(fn, exceptions=(OSError,))
+        self.assertEqual((ok, result, exc), (False, None, err))
+        self.assertEqual(len(calls), 1)
+        self.sleep.assert_not_called()
+
+    def test_memory_error_propagates(self):
+        fn, calls = _failing(MemoryError())
+        with self.assertRaises(MemoryError):
+            retry(fn, exceptions=(BaseException,))
+        self.sleep.assert_not_called()
+
+    def test_deadline_stops_before_an_overrunning_sleep(self):
+        fn, calls = _failing(OSError(), OSError(), OSError())
+        with mock.patch("services.retry.time.monotonic", return_value=100.0):
+            ok, _, exc = retry(fn, attempts=5, backoff=0.5, deadline=1.0)
+        self.assertFalse(ok)
+        self.assertIsInstance(exc, OSError)
+        self.assertEqual(len(calls), 2)  # 0.55 fits in 1.0s; 1.05 doesn't
+        self.assertEqual(len(self.slept()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
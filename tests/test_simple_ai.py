@@ -0,0 +1,114 @@
+import math
+import random
+import sys
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import mock
+
+APP = Path(__file__).resolve().parents[1] / "app"
+if str(APP) not in sys.path:
+    sys.path.insert(0, str(APP))
+
+import chess  # noqa: E402
+import chess.polyglot  # noqa: E402
+from engine import simple_ai  # noqa: E402
+from engine.simple_ai import SimpleAI  # noqa: E402
+
+_MIDDLEGAME = "r1bq1rk1/pp2bppp/2n1pn2/2pp4/3P4/2PBPN2/PP1N1PPP/R1BQK2R w KQ - 0 8"
+
+def _score(fen: str, mv: chess.Move, depth: int) -> float:
+    board = chess.Board(fen)
+    board.push(mv)
+    return -SimpleAI().search(board, depth - 1, -math.inf, math.inf, 1)
+
+class _InlinePool:
+    """Runs tasks at submit time, in this process; `result` overrides the task's return."""
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append(args)
+        fut = Future()
+        fut.set_result(self.result if self.result is not None else fn(*args))
+        return fut
+
+class ParallelRootTest(unittest.TestCase):
+    def test_split_finds_a_move_as_good_as_serial(self):
+        depth = 4
+        serial = SimpleAI().best_move(chess.Board(_MIDDLEGAME), depth)
+        with mock.patch.object(simple_ai, "_get_executor", return_value=_InlinePool()):
+            split = SimpleAI(workers=2).best_move(chess.Board(_MIDDLEGAME), depth)
+        self.assertEqual(_score(_MIDDLEGAME, split, depth), _score(_MIDDLEGAME, serial, depth))
+
+    def test_workers_replay_the_game_history(self):
+        board = chess.Board()
+        for uci in ("g1f3", "g8f6", "f3g1"):
+            board.push_uci(uci)
+        pool = _InlinePool()
+        with mock.patch.object(simple_ai, "_get_executor", return_value=pool):
+            SimpleAI(workers=2).best_move(board, 2)
+        root_fen, stack = pool.calls[0][:2]
+        self.assertEqual(root_fen, chess.STARTING_FEN)
+        self.assertEqual(stack, ["g1f3", "g8f6", "f3g1"])
+
+    def test_timed_out_child_falls_back_to_the_serial_move(self):
+        pool = _InlinePool(result=(None, 0))
+        with mock.patch.object(simple_ai, "_get_executor", return_value=pool):
+            mv = SimpleAI(workers=2).best_move(chess.Board(_MIDDLEGAME), 3)
+        _, fallback = SimpleAI()._deepen(chess.Board(_MIDDLEGAME), 2)
+        self.assertEqual(mv, fallback)
+
+_KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+_PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+_ENDGAME = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+
+def _pure_python() -> SimpleAI:
+    ai = SimpleAI()
+    ai.__dict__.pop("search", None)  # drop the compiled core bound in __init__
+    return ai
+
+@unittest.skipIf(simple_ai._ext is None, "compiled core not built (scripts/build_engine_ext.py)")
+class CompiledCoreTest(unittest.TestCase):
+    def assert_same_as_python(self, board: chess.Board, ai: SimpleAI):
+        ext = simple_ai._ext
+        fen = board.fen()
+        self.assertEqual(ext.legal_move_count(board), board.legal_moves.count(), fen)
+        self.assertEqual(ext.zobrist_hash(board), chess.polyglot.zobrist_hash(board), fen)
+        self.assertEqual(ext.evaluate(board), SimpleAI.evaluate(ai, board), fen)
+        self.assertEqual(ext.is_game_over(board), board.is_game_over(), fen)
+
+    def test_position_queries_match_python_chess(self):
+        rng, ai = random.Random(7), SimpleAI()
+        for _ in range(40):
+            board = chess.Board(rng.choice([chess.STARTING_FEN, _KIWIPETE, _PROMOTIONS, _ENDGAME]))
+            for _ in range(rng.randint(0, 100)):
+                self.assert_same_as_python(board, ai)
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                board.push(rng.choice(moves))
+
+    def test_fivefold_repetition_ends_the_game(self):
+        board, ai = chess.Board(), SimpleAI()
+        for _ in range(4):
+            for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+                board.push_uci(uci)
+                self.assert_same_as_python(board, ai)
+        self.assertTrue(simple_ai._ext.is_game_over(board))
+
+    def test_castling_rights_without_a_move_stack(self):
+        ai = SimpleAI()
+        # rights for rooks/kings that aren't there: python-chess cleans them when the stack is empty
+        for fen in ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "1r2k2r/8/8/8/8/8/8/R3K1R1 b KQkq - 0 1"):
+            self.assert_same_as_python(chess.Board(fen), ai)
+
+    def test_search_matches_pure_python(self):
+        for fen in (chess.STARTING_FEN, _KIWIPETE, _MIDDLEGAME, _ENDGAME):
+            pure, compiled = _pure_python(), SimpleAI()
+            self.assertEqual(compiled.best_move(chess.Board(fen), 3), pure.best_move(chess.Board(fen), 3))
+            self.assertEqual(compiled.nodes, pure.nodes, fen)  # same move order, same tree
+
+if __name__ == "__main__":
+    unittest.main()